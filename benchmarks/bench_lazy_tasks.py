@@ -0,0 +1,67 @@
+"""Compare eager and lazy task loading on a generated Taskfile.
+
+Usage: python benchmarks/bench_lazy_tasks.py [--tasks N] [--repeat N]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from taskfile_parser.repository.repository import TaskFileRepository
+
+
+def generate(tasks: int) -> str:
+    lines = ["version: '3'", "tasks:"]
+    for i in range(tasks):
+        lines += [
+            f"  task-{i}:",
+            f"    desc: Task {i}",
+            "    summary: |",
+            f"      Long summary for task {i}",
+            "      spanning a second line",
+            "    vars:",
+            "      TARGET: build",
+            "      VERSION: {sh: git describe --tags}",
+            f"    deps: [task-{max(i - 1, 0)}, task-{max(i - 2, 0)}]",
+            "    cmds:",
+            *[f"      - echo step {j} for task {i}" for j in range(5)],
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def measure(text: str, lazy: bool, repeat: int) -> tuple[float, float]:
+    """Return the best time to list all commands and the memory retained by the tasks."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        taskfile = TaskFileRepository._read_from_content(text, lazy=lazy)
+        [t.gen_command() for t in taskfile.tasks]
+        best = min(best, time.perf_counter() - started)
+        del taskfile
+
+    gc.collect()
+    tracemalloc.start()
+    taskfile = TaskFileRepository._read_from_content(text, lazy=lazy)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del taskfile
+    return best, retained / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = generate(args.tasks)
+    print(f"{args.tasks} tasks, {len(text.splitlines())} lines, {len(text) / 1024:.0f} KiB")
+    for label, lazy in [("eager", False), ("lazy", True)]:
+        seconds, mib = measure(text, lazy, args.repeat)
+        print(f"{label:>6}: {seconds * 1000:8.1f} ms  {mib:6.2f} MiB retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Show parse count, time and memory as one template is included under more prefixes.
+
+Usage: python benchmarks/bench_parameterized_includes.py [--tasks N] [--includes N ...]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+from taskfile_parser.repository.repository import TaskFileRepository
+
+
+def write_workspace(root: Path, tasks: int, includes: int) -> Path:
+    (root / "deploy").mkdir(exist_ok=True)
+    lines = ["tasks:"]
+    for i in range(tasks):
+        lines += [
+            f"  step-{i}:",
+            f"    desc: Deploy step {i}",
+            "    requires:",
+            "      vars: [REGION]",
+            f"    deps: [step-{max(i - 1, 0)}]",
+            "    cmds:",
+            *[f"      - ./deploy.sh --step {i} --part {j}" for j in range(5)],
+        ]
+    (root / "deploy" / "Taskfile.yml").write_text("\n".join(lines) + "\n")
+    main = ["includes:"]
+    for r in range(includes):
+        main += [f"  region-{r}:", "    taskfile: ./deploy/Taskfile.yml", f"    vars: {{REGION: region-{r}}}"]
+    path = root / "Taskfile.yml"
+    path.write_text("\n".join(main) + "\n")
+    return path
+
+
+def measure(path: Path) -> tuple[int, int, float, float]:
+    """Return the parse count, task count, time in seconds and retained MiB of one read."""
+    read_from_content = TaskFileRepository._read_from_content
+    gc.collect()
+    with patch.object(TaskFileRepository, "_read_from_content", side_effect=read_from_content) as parse:
+        tracemalloc.start()
+        started = time.perf_counter()
+        tasks = TaskFileRepository(str(path)).read_tasks()
+        elapsed = time.perf_counter() - started
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    return parse.call_count, len(tasks), elapsed, retained / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200, help="tasks in the included template")
+    parser.add_argument("--includes", type=int, nargs="+", default=[1, 10, 30, 100])
+    args = parser.parse_args()
+
+    print(f"{'includes':>8} {'parses':>6} {'tasks':>6} {'ms':>8} {'MiB':>7} {'KiB/include':>12}")
+    for includes in args.includes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_workspace(Path(tmp), args.tasks, includes)
+            parses, tasks, seconds, mib = measure(path)
+        print(f"{includes:>8} {parses:>6} {tasks:>6} {seconds * 1000:>8.1f} {mib:>7.2f} {mib * 1024 / includes:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
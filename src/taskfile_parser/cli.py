@@ -1,6 +1,135 @@
 import argparse
+import fnmatch
+import subprocess
+import sys
+import time
+from pathlib import Path
 
+from taskfile_parser.domain.matcher import TaskMatcher
+from taskfile_parser.domain.matrix import partition
+from taskfile_parser.domain.timing import TimingRecord
+from taskfile_parser.lsp.server import TaskfileLanguageServer
+from taskfile_parser.repository.cache import TaskfileCache
+from taskfile_parser.repository.fingerprint import TaskfileFingerprinter
+from taskfile_parser.repository.history import TaskfileHistory
+from taskfile_parser.repository.lockfile import RemoteBundle
+from taskfile_parser.repository.remote import DEFAULT_MAX_REMOTE_BYTES
 from taskfile_parser.repository.repository import TaskfileFinder, TaskFileRepository
+from taskfile_parser.repository.timing import DEFAULT_TIMINGS_PATH, TimingRepository
+
+
+def _find_bundle(path: str, frozen: bool) -> RemoteBundle | None:
+    bundle = RemoteBundle.for_taskfile(path, frozen=frozen)
+    if bundle.exists() or frozen:
+        return bundle
+    return None
+
+
+def _cache(args: argparse.Namespace) -> TaskfileCache | None:
+    return None if args.no_cache else TaskfileCache()
+
+
+def _run_buffer(args: argparse.Namespace) -> str:
+    path = TaskfileFinder(root_dir=args.pwd).find()
+    task_name = args.taskfile_task_name
+    if not path:
+        return ""
+    repository = TaskFileRepository(
+        path,
+        bundle=_find_bundle(path, args.frozen),
+        max_remote_bytes=args.max_remote_bytes,
+        cache=_cache(args),
+    )
+    tasks = repository.read_tasks()
+    match = TaskMatcher(tasks).match(task_name)
+    if match is None:
+        sys.exit(f"Task not found: {task_name}")
+    if not args.no_resolve_vars:
+        # Only run the dynamic variables of the requested task
+        repository.resolve_task_vars([match.task])
+    buffer = match.task.gen_buffer(match.command)
+    print(buffer)
+    return buffer
+
+
+def _run_lock(args: argparse.Namespace) -> str:
+    path = TaskfileFinder(root_dir=args.pwd).find()
+    if not path:
+        return ""
+    urls = TaskFileRepository(path).remote_urls()
+    bundle = RemoteBundle.for_taskfile(path)
+    if args.frozen:
+        stale = bundle.stale_urls(urls)
+        if stale:
+            sys.exit(f"Lockfile is stale: {', '.join(stale)}")
+        return str(bundle.lockfile_path)
+    bundle.lock(urls, max_bytes=args.max_remote_bytes)
+    print(bundle.lockfile_path)
+    return str(bundle.lockfile_path)
+
+
+def _run_history(args: argparse.Namespace) -> str:
+    lines = []
+    with TaskfileHistory(args.pwd) as history:
+        for diff in history.diffs(history.revisions(args.range, args.max_count)):
+            if not diff.is_empty():
+                lines.append(diff.model_dump_json())
+    output = "\n".join(lines)
+    if output:
+        print(output)
+    return output
+
+
+def _timings(args: argparse.Namespace) -> TimingRepository:
+    return TimingRepository(args.timings or str(Path(args.pwd) / DEFAULT_TIMINGS_PATH))
+
+
+def _run_matrix(args: argparse.Namespace) -> str:
+    path = TaskfileFinder(root_dir=args.pwd).find()
+    if not path:
+        return ""
+    tasks = TaskFileRepository(path, bundle=_find_bundle(path, False), cache=_cache(args)).read_tasks()
+    patterns = args.select or ["*"]
+    # Wildcard tasks need concrete arguments, so they cannot be scheduled as-is
+    selected = [
+        t for t in tasks if "*" not in t.name and any(fnmatch.fnmatchcase(t.gen_command(), p) for p in patterns)
+    ]
+    estimates = _timings(args).estimates()
+    known = [estimates[t.gen_command()] for t in selected if t.gen_command() in estimates]
+    default = sum(known) / len(known) if known else 1.0
+    output = partition(selected, estimates, args.shards, default=default).model_dump_json()
+    print(output)
+    return output
+
+
+def _run_record(args: argparse.Namespace) -> str:
+    command = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+    if not command:
+        command = ["task", args.taskfile_task_name]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=args.pwd)
+    duration = time.perf_counter() - started
+    if completed.returncode != 0:
+        # Failed runs would skew the estimates, so only successes are recorded
+        sys.exit(completed.returncode)
+    record = TimingRecord(task=args.taskfile_task_name, duration=duration, recorded_at=time.time())
+    _timings(args).append(record)
+    return record.model_dump_json()
+
+
+def _run_fingerprint(args: argparse.Namespace) -> str:
+    path = TaskfileFinder(root_dir=args.pwd).find()
+    if not path:
+        sys.exit(f"Taskfile not found in {args.pwd}")
+    fingerprint = TaskfileFingerprinter().fingerprint(path)
+    output = fingerprint.model_dump_json() if args.json else fingerprint.sha256
+    print(output)
+    return output
+
+
+def _run_lsp(args: argparse.Namespace) -> str:
+    TaskfileLanguageServer().serve(sys.stdin.buffer, sys.stdout.buffer)
+    return ""
 
 
 def main():
@@ -11,17 +140,70 @@ def main():
     # 引数・オプションの定義
     parser.add_argument("--pwd", type=str)
     parser.add_argument("--taskfile-task-name", type=str)
+    parser.add_argument("--frozen", action="store_true", help="fail instead of fetching unlocked remote includes")
+    parser.add_argument("--max-remote-bytes", type=int, default=DEFAULT_MAX_REMOTE_BYTES)
+    parser.add_argument("--no-resolve-vars", action="store_true", help="do not pre-fill buffers from `vars`")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the shared include and parse cache")
+    subparsers = parser.add_subparsers(dest="command")
+    # Options repeated on subcommands suppress their defaults, so `parser --pwd DIR lock` is not overridden
+
+    lock_parser = subparsers.add_parser("lock", help="resolve remote includes into a lockfile and bundle")
+    lock_parser.add_argument("--pwd", type=str, default=argparse.SUPPRESS)
+    lock_parser.add_argument(
+        "--frozen",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="fail if the lockfile is stale instead of updating",
+    )
+    lock_parser.add_argument("--max-remote-bytes", type=int, default=argparse.SUPPRESS)
+
+    history_parser = subparsers.add_parser("history", help="print task catalog diffs across git revisions")
+    history_parser.add_argument("--pwd", type=str, default=argparse.SUPPRESS)
+    history_parser.add_argument("--range", type=str, default="HEAD", help="revision range passed to git rev-list")
+    history_parser.add_argument("--max-count", type=int, default=None)
+
+    matrix_parser = subparsers.add_parser("matrix", help="split tasks into CI shards balanced by recorded durations")
+    matrix_parser.add_argument("--pwd", type=str, default=argparse.SUPPRESS)
+    matrix_parser.add_argument("--select", action="append", help="glob matched against task names (repeatable)")
+    matrix_parser.add_argument("--shards", type=int, required=True)
+    matrix_parser.add_argument("--timings", type=str, default=None)
+    matrix_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="do not use the shared include and parse cache",
+    )
+
+    record_parser = subparsers.add_parser("record", help="run a task and append its duration to the timing history")
+    record_parser.add_argument("--pwd", type=str, default=argparse.SUPPRESS)
+    record_parser.add_argument("--taskfile-task-name", type=str, default=argparse.SUPPRESS)
+    record_parser.add_argument("--timings", type=str, default=None)
+    record_parser.add_argument("cmd", nargs=argparse.REMAINDER, help="command to run instead of `task <name>`")
+
+    fingerprint_parser = subparsers.add_parser("fingerprint", help="print a hash of the Taskfile and its includes")
+    fingerprint_parser.add_argument("--pwd", type=str, default=argparse.SUPPRESS)
+    fingerprint_parser.add_argument("--json", action="store_true", help="print the hash of every file as JSON")
+
+    subparsers.add_parser("lsp", help="run the Taskfile language server over stdio")
     args = parser.parse_args()
+    if args.command is not None and args.pwd is None:
+        args.pwd = "."
+    if args.command == "record" and args.taskfile_task_name is None:
+        record_parser.error("the following arguments are required: --taskfile-task-name")
 
-    path = TaskfileFinder(root_dir=args.pwd).find()
-    task_name = args.taskfile_task_name
-    if not path:
-        return ""
-    tasks = TaskFileRepository(path).read_tasks()
-    target_task = [v for v in tasks if v.gen_command() == task_name]
-    buffer = target_task[0].gen_buffer()
-    print(buffer)
-    return buffer
+    if args.command == "lock":
+        return _run_lock(args)
+    if args.command == "history":
+        return _run_history(args)
+    if args.command == "matrix":
+        return _run_matrix(args)
+    if args.command == "record":
+        return _run_record(args)
+    if args.command == "fingerprint":
+        return _run_fingerprint(args)
+    if args.command == "lsp":
+        return _run_lsp(args)
+    return _run_buffer(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class CachedInclude(BaseModel):
+    url: str
+    sha256: str
+    size: int
+    # Unix time of the last fetch or successful revalidation
+    fetched_at: float
+    # Validators sent back to the server to revalidate the cached body
+    etag: str | None = None
+    last_modified: str | None = None
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+from taskfile_parser.domain.taskfile import Include
+
+
+class FileDigest(BaseModel):
+    # Stat fields the digest is valid for
+    mtime_ns: int
+    size: int
+    sha256: str
+    includes: list[Include]
+
+
+class FingerprintNode(BaseModel):
+    # Absolute path of a local taskfile or URL of a remote include
+    source: str
+    # Merkle hash of the source and everything it includes
+    sha256: str
+
+
+class Fingerprint(BaseModel):
+    root: str
+    sha256: str
+    nodes: list[FingerprintNode]
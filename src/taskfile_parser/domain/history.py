@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class TaskChange(BaseModel):
+    command: str
+    # Names of the Task fields that differ, e.g. ["requires"]
+    fields: list[str]
+
+
+class CatalogDiff(BaseModel):
+    revision: str
+    parent: str | None
+    added: list[str]
+    removed: list[str]
+    changed: list[TaskChange]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class LockedInclude(BaseModel):
+    url: str
+    sha256: str
+    size: int
+
+
+class Lockfile(BaseModel):
+    version: int = 1
+    includes: list[LockedInclude]
+
+    def get(self, url: str) -> LockedInclude | None:
+        for i in self.includes:
+            if i.url == url:
+                return i
+        return None
+
+    def urls(self) -> list[str]:
+        return [i.url for i in self.includes]
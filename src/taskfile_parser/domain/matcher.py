@@ -0,0 +1,57 @@
+import re
+
+from pydantic import BaseModel
+
+from taskfile_parser.domain.taskfile import Task
+
+
+class TaskMatch(BaseModel):
+    task: Task
+    # The command to run: the canonical name, or the requested name for wildcard tasks
+    command: str
+    captures: list[str] = []
+
+
+class TaskMatcher:
+    """Look up tasks by name, alias or wildcard pattern such as ``deploy:*``.
+
+    Exact names and aliases go into a dict; every wildcard pattern is
+    compiled into one alternation, tried in definition order, so a lookup
+    costs one hash probe plus at most one regex match.
+    """
+
+    def __init__(self, tasks: list[Task]):
+        self._exact: dict[str, Task] = {}
+        self._wildcards: list[tuple[Task, int, int]] = []
+        alternatives = []
+        group = 1
+        for task in tasks:
+            command = task.gen_command()
+            aliases = task.gen_aliases()
+            if "*" in command:
+                # A plain alias of a wildcard task has nothing to fill the pattern with
+                aliases = [a for a in aliases if "*" in a]
+            for name in [command, *aliases]:
+                if "*" not in name:
+                    self._exact.setdefault(name, task)
+                    continue
+                pieces = name.split("*")
+                alternatives.append("(" + "(.*)".join(re.escape(p) for p in pieces) + ")")
+                # Remember the outer group number and how many captures follow it
+                self._wildcards.append((task, group, len(pieces) - 1))
+                group += len(pieces)
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+        self._by_group = {g: i for i, (_, g, _) in enumerate(self._wildcards)}
+
+    def match(self, name: str) -> TaskMatch | None:
+        task = self._exact.get(name)
+        if task is not None:
+            return TaskMatch(task=task, command=task.gen_command())
+        if self._pattern is None:
+            return None
+        m = self._pattern.fullmatch(name)
+        if m is None or m.lastindex is None:
+            return None
+        task, group, count = self._wildcards[self._by_group[m.lastindex]]
+        captures = [m.group(g) for g in range(group + 1, group + 1 + count)]
+        return TaskMatch(task=task, command=name, captures=captures)
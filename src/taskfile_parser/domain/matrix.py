@@ -0,0 +1,98 @@
+from pydantic import BaseModel
+
+from taskfile_parser.domain.taskfile import Task
+
+
+class Shard(BaseModel):
+    shard: int
+    tasks: list[str]
+    estimated_seconds: float
+
+
+class Matrix(BaseModel):
+    # Shaped like a GitHub Actions `strategy.matrix` so it can be passed to fromJSON()
+    include: list[Shard]
+
+
+def _closures(tasks: list[Task]) -> dict[str, set[str]]:
+    """Map each command to itself and the commands of ``tasks`` it depends on, transitively."""
+    deps = {t.gen_command(): t.gen_deps() for t in tasks}
+    closures: dict[str, set[str]] = {}
+    for command in deps:
+        closure = {command}
+        stack = [command]
+        while stack:
+            for dep in deps[stack.pop()]:
+                if dep in deps and dep not in closure:
+                    closure.add(dep)
+                    stack.append(dep)
+        closures[command] = closure
+    return closures
+
+
+def _ordered(tasks: list[Task]) -> list[Task]:
+    """Order tasks so every task comes after the deps it shares a shard with."""
+    commands = {t.gen_command() for t in tasks}
+    pending = {t.gen_command(): {d for d in t.gen_deps() if d in commands} for t in tasks}
+    ordered: list[Task] = []
+    while len(ordered) < len(tasks):
+        ready = [t for t in tasks if t.gen_command() in pending and not pending[t.gen_command()]]
+        if not ready:
+            # Dependency cycle; keep the remaining tasks in their catalog order
+            ready = [t for t in tasks if t.gen_command() in pending]
+        for t in ready:
+            del pending[t.gen_command()]
+            ordered.append(t)
+        done = {t.gen_command() for t in ready}
+        for deps in pending.values():
+            deps -= done
+    return ordered
+
+
+def partition(tasks: list[Task], estimates: dict[str, float], shards: int, default: float = 1.0) -> Matrix:
+    """Split ``tasks`` into at most ``shards`` shards with balanced estimated durations.
+
+    go-task runs the deps of a task along with it, so each task costs its own
+    estimate plus those of its deps that its shard does not run already.
+    Tasks are placed longest first, each on the shard that keeps the longest
+    shard shortest, preferring shards that already run its deps. Deps only
+    order the tasks within a shard; tasks sharing a dep may land on
+    different shards, each running the dep.
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+
+    def cost(commands: set[str]) -> float:
+        return sum(estimates.get(c, default) for c in commands)
+
+    closures = _closures(tasks)
+    loads = [0.0] * shards
+    # Commands each shard runs, including deps go-task runs on its behalf
+    covered: list[set[str]] = [set() for _ in range(shards)]
+    assigned: list[list[Task]] = [[] for _ in range(shards)]
+    for task in sorted(tasks, key=lambda t: cost(closures[t.gen_command()]), reverse=True):
+        closure = closures[task.gen_command()]
+        added = [cost(closure - c) for c in covered]
+        longest = max(loads)
+        i = min(
+            range(shards),
+            key=lambda i: (max(longest, loads[i] + added[i]), added[i], loads[i] + added[i], i),
+        )
+        assigned[i].append(task)
+        loads[i] += added[i]
+        covered[i] |= closure
+
+    order = {t.gen_command(): n for n, t in enumerate(tasks)}
+    include = []
+    for group, load in zip(assigned, loads, strict=True):
+        if not group:
+            continue
+        group = _ordered(sorted(group, key=lambda t: order[t.gen_command()]))
+        include.append(
+            Shard(
+                shard=len(include),
+                tasks=[t.gen_command() for t in group],
+                estimated_seconds=round(load, 3),
+            )
+        )
+    return Matrix(include=include)
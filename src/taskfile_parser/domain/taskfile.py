@@ -1,9 +1,26 @@
-from pydantic import BaseModel
+import shlex
+from abc import ABC, abstractmethod
+
+from pydantic import BaseModel, PrivateAttr, computed_field, model_validator
 
 
 class Include(BaseModel):
     prefix: str
     taskfile: str
+    vars: dict = {}
+    # Working directory of the included tasks, relative to the including taskfile
+    dir: str | None = None
+
+
+class LazyValue(ABC):
+    """A field value that is only loaded from the taskfile when first accessed."""
+
+    @abstractmethod
+    def load(self) -> object: ...
+
+
+# Task fields that may be passed as a LazyValue, with the type a loaded value must have
+LAZY_FIELDS: dict[str, type] = {"cmds": list, "summary": str, "deps": list, "vars": dict}
 
 
 class Task(BaseModel):
@@ -11,6 +28,60 @@ class Task(BaseModel):
     prefix: str | None
     name: str
     requires: dict
+    aliases: list[str] = []
+    # Values of variables after applying global, include and task-level `vars`
+    resolved_vars: dict[str, str] = {}
+
+    # Values of LAZY_FIELDS as given, replaced by the loaded value on first access
+    _lazy: dict[str, object] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _split_lazy_fields(cls, data, handler):
+        if not isinstance(data, dict) or not LAZY_FIELDS.keys() & data.keys():
+            return handler(data)
+        data = dict(data)
+        lazy = {name: data.pop(name) for name in LAZY_FIELDS if name in data}
+        task = handler(data)
+        task._lazy = lazy
+        return task
+
+    def _load(self, name: str):
+        value = self._lazy.get(name)
+        expected = LAZY_FIELDS[name]
+        if not isinstance(value, expected):
+            if isinstance(value, LazyValue):
+                value = value.load()
+            if not isinstance(value, expected):
+                value = expected()
+            self._lazy[name] = value
+        return value
+
+    @computed_field(repr=False)
+    @property
+    def cmds(self) -> list:
+        return self._load("cmds")
+
+    @computed_field(repr=False)
+    @property
+    def summary(self) -> str:
+        return self._load("summary")
+
+    @computed_field(repr=False)
+    @property
+    def deps(self) -> list:
+        return self._load("deps")
+
+    @computed_field(repr=False)
+    @property
+    def vars(self) -> dict:
+        return self._load("vars")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        # Compare loaded values rather than how far each task has been loaded
+        return self.model_dump() == other.model_dump()
 
     def gen_command(self) -> str:
         if self.prefix:
@@ -18,7 +89,30 @@ class Task(BaseModel):
         else:
             return self.name
 
-    def gen_buffer(self) -> str:
+    def gen_aliases(self) -> list[str]:
+        if self.prefix:
+            return [f"{self.prefix}:{a}" for a in self.aliases]
+        else:
+            return list(self.aliases)
+
+    def gen_deps(self) -> list[str]:
+        """Return the commands of the tasks this task depends on."""
+        commands = []
+        for d in self.deps:
+            name = d.get("task", "") if isinstance(d, dict) else str(d)
+            if not name:
+                continue
+            if name.startswith(":"):
+                # A leading colon refers to a task of the root Taskfile
+                commands.append(name[1:])
+            elif self.prefix:
+                commands.append(f"{self.prefix}:{name}")
+            else:
+                commands.append(name)
+        return commands
+
+    def gen_buffer(self, command: str | None = None) -> str:
+        command = command or self.gen_command()
         vars_list = self.requires.get("vars") if self.requires else None
         if vars_list:
             var_args = []
@@ -29,21 +123,36 @@ class Task(BaseModel):
                     if name:
                         # Check if enum is specified
                         enum_values = v.get("enum", [])
-                        if enum_values:
+                        if name in self.resolved_vars:
+                            var_args.append(f"{name}={shlex.quote(self.resolved_vars[name])}")
+                        elif enum_values:
                             # Join enum values with pipe separator
                             # Enum values are expected to be simple types (str, int, etc.)
                             enum_str = "|".join(str(val) for val in enum_values)
                             var_args.append(f"{name}={enum_str}")
                         else:
                             var_args.append(f"{name}=")
+                elif v in self.resolved_vars:
+                    var_args.append(f"{v}={shlex.quote(self.resolved_vars[v])}")
                 else:
                     var_args.append(f"{v}=")
             if var_args:
                 args = " ".join(var_args)
-                return f"{args} task {self.gen_command()}"
-        return f"task {self.gen_command()}"
+                return f"{args} task {command}"
+        return f"task {command}"
 
 
 class Taskfile(BaseModel):
     includes: list[Include]
     tasks: list[Task]
+    vars: dict = {}
+
+    def instantiate(self, prefix: str | None) -> "Taskfile":
+        """Return a copy whose tasks carry ``prefix``.
+
+        Copies are shallow, so every field other than the prefix and the
+        per-instance ``resolved_vars`` is shared with this taskfile, including
+        lazily loaded fields once any copy has loaded them.
+        """
+        tasks = [t.model_copy(update={"prefix": prefix, "resolved_vars": {}}) for t in self.tasks]
+        return self.model_copy(update={"tasks": tasks})
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class TimingRecord(BaseModel):
+    task: str
+    duration: float
+    # Unix time the run finished
+    recorded_at: float
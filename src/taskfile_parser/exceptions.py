@@ -0,0 +1,18 @@
+class TaskfileParserError(Exception):
+    """Base class for errors raised by taskfile-parser."""
+
+
+class LockfileError(TaskfileParserError):
+    """Raised when the remote include lockfile or its bundle cannot be used."""
+
+
+class RemoteFetchError(TaskfileParserError):
+    """Raised when a remote include is rejected, e.g. because it is too large."""
+
+
+class YamlLimitError(TaskfileParserError):
+    """Raised when a YAML document exceeds the configured size or complexity limits."""
+
+
+class LockTimeoutError(TaskfileParserError):
+    """Raised when a file lock shared with other processes cannot be acquired in time."""
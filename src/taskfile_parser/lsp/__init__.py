@@ -0,0 +1 @@
+"""Language server for Taskfiles."""
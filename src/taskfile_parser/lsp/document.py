@@ -0,0 +1,60 @@
+def utf16_to_index(line: str, character: int) -> int:
+    """Convert an LSP (UTF-16) character offset into a str index for ``line``."""
+    units = 0
+    for index, ch in enumerate(line):
+        if units >= character:
+            return index
+        units += 2 if ord(ch) > 0xFFFF else 1
+    return len(line)
+
+
+def index_to_utf16(line: str, index: int) -> int:
+    """Convert a str index in ``line`` into an LSP (UTF-16) character offset."""
+    return sum(2 if ord(ch) > 0xFFFF else 1 for ch in line[:index])
+
+
+class TextDocument:
+    def __init__(self, uri: str, text: str, version: int = 0):
+        self.uri = uri
+        self.version = version
+        self._text = text
+        self._line_starts: list[int] | None = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def _starts(self) -> list[int]:
+        if self._line_starts is None:
+            starts = [0]
+            pos = self._text.find("\n")
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = self._text.find("\n", pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line(self, line: int) -> str:
+        starts = self._starts()
+        if line >= len(starts):
+            return ""
+        end = starts[line + 1] - 1 if line + 1 < len(starts) else len(self._text)
+        return self._text[starts[line] : end]
+
+    def offset_at(self, line: int, character: int) -> int:
+        starts = self._starts()
+        if line >= len(starts):
+            return len(self._text)
+        return starts[line] + utf16_to_index(self.line(line), character)
+
+    def apply_change(self, change: dict) -> None:
+        """Apply a ``TextDocumentContentChangeEvent`` (full or ranged)."""
+        if "range" not in change:
+            self._text = change["text"]
+        else:
+            start = change["range"]["start"]
+            end = change["range"]["end"]
+            start_offset = self.offset_at(start["line"], start["character"])
+            end_offset = self.offset_at(end["line"], end["character"])
+            self._text = self._text[:start_offset] + change["text"] + self._text[end_offset:]
+        self._line_starts = None
@@ -0,0 +1,139 @@
+from bisect import bisect_right
+
+import yaml
+from pydantic import BaseModel, PrivateAttr
+
+from taskfile_parser.domain.taskfile import Task, Taskfile
+from taskfile_parser.repository.loader import DEFAULT_LOCAL_LIMITS, LimitedSafeLoader, YamlLimits
+from taskfile_parser.repository.repository import TaskFileRepository
+
+
+class Span(BaseModel):
+    start_line: int
+    start_character: int
+    end_line: int
+    end_character: int
+
+    @classmethod
+    def from_node(cls, node: yaml.Node) -> "Span":
+        return cls(
+            start_line=node.start_mark.line,
+            start_character=node.start_mark.column,
+            end_line=node.end_mark.line,
+            end_character=node.end_mark.column,
+        )
+
+    def contains(self, line: int, character: int) -> bool:
+        return (self.start_line, self.start_character) <= (line, character) <= (self.end_line, self.end_character)
+
+
+class Symbol(BaseModel):
+    # "task" for a task definition, "include" for an include prefix, "reference" for a task call
+    kind: str
+    name: str
+    span: Span
+
+
+class IncludeEntry(BaseModel):
+    prefix: str
+    taskfile: str
+    span: Span
+
+
+class TaskfileIndex(BaseModel):
+    taskfile: Taskfile
+    tasks: dict[str, Span]
+    includes: dict[str, IncludeEntry]
+    symbols: list[Symbol]
+
+    _starts: list[tuple[int, int]] = PrivateAttr(default_factory=list)
+    _tasks_by_name: dict[str, Task] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        self.symbols.sort(key=lambda s: (s.span.start_line, s.span.start_character))
+        self._starts = [(s.span.start_line, s.span.start_character) for s in self.symbols]
+        self._tasks_by_name = {t.name: t for t in self.taskfile.tasks}
+
+    @classmethod
+    def build(cls, text: str, limits: YamlLimits = DEFAULT_LOCAL_LIMITS) -> "TaskfileIndex":
+        """Compose ``text`` once within ``limits`` and index it.
+
+        Raises ``yaml.YAMLError`` on invalid YAML and ``YamlLimitError`` when
+        the document exceeds ``limits``.
+        """
+        loader = LimitedSafeLoader(text, limits)
+        try:
+            root = loader.get_node() if loader.check_node() else None
+            data = loader.construct_document(root) if root is not None else None
+        finally:
+            loader.dispose()
+
+        if not isinstance(root, yaml.MappingNode) or not isinstance(data, dict):
+            return cls(taskfile=Taskfile(includes=[], tasks=[]), tasks={}, includes={}, symbols=[])
+
+        tasks: dict[str, Span] = {}
+        includes: dict[str, IncludeEntry] = {}
+        symbols: list[Symbol] = []
+        for key, value in root.value:
+            if key.value == "tasks" and isinstance(value, yaml.MappingNode):
+                for task_key, task_value in value.value:
+                    span = Span.from_node(task_key)
+                    tasks[task_key.value] = span
+                    symbols.append(Symbol(kind="task", name=task_key.value, span=span))
+                    symbols.extend(_task_references(task_value))
+            elif key.value == "includes" and isinstance(value, yaml.MappingNode):
+                for include_key, include_value in value.value:
+                    taskfile = _include_taskfile(include_value)
+                    span = Span.from_node(include_key)
+                    includes[include_key.value] = IncludeEntry(prefix=include_key.value, taskfile=taskfile, span=span)
+                    symbols.append(Symbol(kind="include", name=include_key.value, span=span))
+
+        return cls(
+            taskfile=TaskFileRepository._read_from_data(data),
+            tasks=tasks,
+            includes=includes,
+            symbols=symbols,
+        )
+
+    def task(self, name: str) -> Task | None:
+        return self._tasks_by_name.get(name)
+
+    def symbol_at(self, line: int, character: int) -> Symbol | None:
+        i = bisect_right(self._starts, (line, character)) - 1
+        if i >= 0 and self.symbols[i].span.contains(line, character):
+            return self.symbols[i]
+        return None
+
+
+def _include_taskfile(node: yaml.Node) -> str:
+    if isinstance(node, yaml.ScalarNode):
+        return node.value
+    if isinstance(node, yaml.MappingNode):
+        for k, v in node.value:
+            if k.value == "taskfile" and isinstance(v, yaml.ScalarNode):
+                return v.value
+    return ""
+
+
+def _call_reference(node: yaml.Node) -> Symbol | None:
+    """Return the task referenced by a ``deps`` or ``cmds`` item, if any."""
+    if isinstance(node, yaml.MappingNode):
+        for k, v in node.value:
+            if k.value == "task" and isinstance(v, yaml.ScalarNode):
+                return Symbol(kind="reference", name=v.value.lstrip(":"), span=Span.from_node(v))
+    return None
+
+
+def _task_references(node: yaml.Node) -> list[Symbol]:
+    references: list[Symbol] = []
+    if not isinstance(node, yaml.MappingNode):
+        return references
+    for k, v in node.value:
+        if k.value not in ("deps", "cmds") or not isinstance(v, yaml.SequenceNode):
+            continue
+        for item in v.value:
+            if k.value == "deps" and isinstance(item, yaml.ScalarNode):
+                references.append(Symbol(kind="reference", name=item.value.lstrip(":"), span=Span.from_node(item)))
+            elif (reference := _call_reference(item)) is not None:
+                references.append(reference)
+    return references
@@ -0,0 +1,324 @@
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import unquote, urlparse
+
+import yaml
+
+from taskfile_parser.domain.taskfile import Task
+from taskfile_parser.exceptions import YamlLimitError
+from taskfile_parser.lsp.document import TextDocument, index_to_utf16, utf16_to_index
+from taskfile_parser.lsp.index import Span, Symbol, TaskfileIndex
+from taskfile_parser.repository.remote import is_remote
+
+# CompletionItemKind.Function / MarkupKind.Markdown
+_COMPLETION_KIND_FUNCTION = 3
+_MARKDOWN = "markdown"
+
+# JSON-RPC error codes
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INTERNAL_ERROR = -32603
+
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlparse(uri).path))
+
+
+def read_message(reader: BinaryIO) -> dict | None:
+    """Read one ``Content-Length`` framed message, or ``None`` at end of stream."""
+    length = None
+    while True:
+        header = reader.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value.strip())
+    if length is None:
+        return None
+    return json.loads(reader.read(length).decode("utf-8"))
+
+
+def _error(request_id: int | str | None, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def write_message(writer: BinaryIO, message: dict) -> None:
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    writer.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii"))
+    writer.write(body)
+    writer.flush()
+
+
+class TaskfileLanguageServer:
+    """Serve go-to-definition, hover and completion for Taskfile task names.
+
+    Open documents are kept in memory and re-indexed individually on the
+    first request after a change, so a burst of edits costs one re-index;
+    included files that are not open are indexed from disk and reused until
+    their mtime or size changes.
+
+    A message that fails to be handled never stops the server: requests are
+    answered with an internal error and notifications are dropped.
+    """
+
+    def __init__(self):
+        self.documents: dict[str, TextDocument] = {}
+        self.indexes: dict[str, TaskfileIndex] = {}
+        # Open documents changed since they were last indexed
+        self._stale: set[str] = set()
+        self._disk_indexes: dict[Path, tuple[tuple[int, int], TaskfileIndex]] = {}
+        self.running = True
+
+    # --- transport -------------------------------------------------------
+
+    def serve(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        while self.running:
+            try:
+                message = read_message(reader)
+            except ValueError:
+                # Not JSON, so there is no id to answer to
+                write_message(writer, _error(None, _PARSE_ERROR, "Parse error"))
+                continue
+            if message is None:
+                break
+            response = self.handle(message)
+            if response is not None:
+                write_message(writer, response)
+
+    def handle(self, message: object) -> dict | None:
+        if not isinstance(message, dict):
+            return _error(None, _INVALID_REQUEST, "Invalid request")
+        method = message.get("method")
+        params = message.get("params") or {}
+        handler = {
+            "initialize": self._initialize,
+            "shutdown": self._do_shutdown,
+            "exit": self._exit,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+            "textDocument/definition": self._definition,
+            "textDocument/hover": self._hover,
+            "textDocument/completion": self._completion,
+        }.get(method or "")
+
+        if "id" not in message:
+            # Notifications never get a response, even if unknown or failed
+            if handler is not None:
+                with contextlib.suppress(Exception):
+                    handler(params)
+            return None
+        if handler is None:
+            return _error(message["id"], _METHOD_NOT_FOUND, f"Method not found: {method}")
+        try:
+            result = handler(params)
+        except Exception as e:
+            return _error(message["id"], _INTERNAL_ERROR, f"{method} failed: {e!r}")
+        return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+    # --- lifecycle -------------------------------------------------------
+
+    def _initialize(self, params: dict) -> dict:
+        return {
+            "capabilities": {
+                # TextDocumentSyncKind.Incremental
+                "textDocumentSync": {"openClose": True, "change": 2},
+                "definitionProvider": True,
+                "hoverProvider": True,
+                "completionProvider": {"triggerCharacters": [":"]},
+            },
+            "serverInfo": {"name": "taskfile-parser"},
+        }
+
+    def _do_shutdown(self, params: dict) -> None:
+        return None
+
+    def _exit(self, params: dict) -> None:
+        self.running = False
+
+    # --- document sync ---------------------------------------------------
+
+    def _did_open(self, params: dict) -> None:
+        item = params["textDocument"]
+        self.documents[item["uri"]] = TextDocument(item["uri"], item["text"], item.get("version", 0))
+        # Index right away, so there is a last good index to serve while later edits are broken
+        self._stale.add(item["uri"])
+        self._index(item["uri"])
+
+    def _did_change(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        document = self.documents.get(uri)
+        if document is None:
+            return
+        for change in params.get("contentChanges", []):
+            document.apply_change(change)
+        document.version = params["textDocument"].get("version", document.version)
+        self._stale.add(uri)
+
+    def _did_close(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self.indexes.pop(uri, None)
+        self._stale.discard(uri)
+
+    def _index(self, uri: str) -> TaskfileIndex | None:
+        """Return the index of the open document ``uri``, re-indexing it first if it changed."""
+        if uri in self._stale:
+            self._stale.discard(uri)
+            try:
+                self.indexes[uri] = TaskfileIndex.build(self.documents[uri].text)
+            except (yaml.YAMLError, YamlLimitError, AttributeError, TypeError, ValueError):
+                # Keep serving the last good index while the user is mid-edit
+                pass
+        return self.indexes.get(uri)
+
+    # --- resolution ------------------------------------------------------
+
+    def _index_for_path(self, path: Path) -> TaskfileIndex | None:
+        index = self._index(path.as_uri())
+        if index is not None:
+            return index
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._disk_indexes.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            index = TaskfileIndex.build(path.read_text(encoding="utf-8"))
+        except (OSError, yaml.YAMLError, YamlLimitError, AttributeError, TypeError, ValueError):
+            return None
+        self._disk_indexes[path] = (key, index)
+        return index
+
+    def _included(self, uri: str, prefix: str) -> tuple[Path, TaskfileIndex] | None:
+        index = self._index(uri)
+        if index is None or prefix not in index.includes:
+            return None
+        taskfile = index.includes[prefix].taskfile
+        if not taskfile or is_remote(taskfile):
+            return None
+        path = Path(os.path.normpath(uri_to_path(uri).parent / taskfile))
+        included = self._index_for_path(path)
+        return (path, included) if included is not None else None
+
+    def _resolve(self, uri: str, name: str) -> tuple[str, Span, Task] | None:
+        """Resolve ``name`` as seen from ``uri`` into the defining uri, span and task."""
+        index = self._index(uri)
+        if index is None:
+            return None
+        task = index.task(name)
+        if task is not None:
+            return uri, index.tasks[name], task
+        prefix, sep, rest = name.partition(":")
+        if not sep:
+            return None
+        included = self._included(uri, prefix)
+        if included is None:
+            return None
+        path, included_index = included
+        task = included_index.task(rest)
+        if task is None:
+            return None
+        return path.as_uri(), included_index.tasks[rest], task.model_copy(update={"prefix": prefix})
+
+    def _symbol_at(self, params: dict) -> Symbol | None:
+        uri = params["textDocument"]["uri"]
+        document = self.documents.get(uri)
+        index = self._index(uri)
+        if document is None or index is None:
+            return None
+        line = params["position"]["line"]
+        character = utf16_to_index(document.line(line), params["position"]["character"])
+        return index.symbol_at(line, character)
+
+    def _range(self, uri: str, span: Span) -> dict:
+        document = self.documents.get(uri)
+        if document is None:
+            start, end = span.start_character, span.end_character
+        else:
+            start = index_to_utf16(document.line(span.start_line), span.start_character)
+            end = index_to_utf16(document.line(span.end_line), span.end_character)
+        return {
+            "start": {"line": span.start_line, "character": start},
+            "end": {"line": span.end_line, "character": end},
+        }
+
+    # --- features --------------------------------------------------------
+
+    def _definition(self, params: dict) -> dict | None:
+        uri = params["textDocument"]["uri"]
+        symbol = self._symbol_at(params)
+        if symbol is None:
+            return None
+        if symbol.kind == "include":
+            included = self._included(uri, symbol.name)
+            if included is None:
+                return None
+            zero = {"line": 0, "character": 0}
+            return {"uri": included[0].as_uri(), "range": {"start": zero, "end": zero}}
+        resolved = self._resolve(uri, symbol.name)
+        if resolved is None:
+            return None
+        target_uri, span, _ = resolved
+        return {"uri": target_uri, "range": self._range(target_uri, span)}
+
+    def _hover(self, params: dict) -> dict | None:
+        uri = params["textDocument"]["uri"]
+        symbol = self._symbol_at(params)
+        if symbol is None or symbol.kind == "include":
+            return None
+        resolved = self._resolve(uri, symbol.name)
+        if resolved is None:
+            return None
+        _, _, task = resolved
+
+        lines = [f"**{task.gen_command()}**"]
+        if task.desc:
+            lines += ["", task.desc]
+        required = _required_var_names(task)
+        if required:
+            lines += ["", "Required vars: " + ", ".join(f"`{v}`" for v in required)]
+        lines += ["", "```sh", task.gen_buffer(), "```"]
+        return {
+            "contents": {"kind": _MARKDOWN, "value": "\n".join(lines)},
+            "range": self._range(uri, symbol.span),
+        }
+
+    def _completion(self, params: dict) -> list[dict]:
+        uri = params["textDocument"]["uri"]
+        index = self._index(uri)
+        if index is None:
+            return []
+        items = [_completion_item(t) for t in index.taskfile.tasks]
+        for prefix in index.includes:
+            included = self._included(uri, prefix)
+            if included is None:
+                continue
+            for t in included[1].taskfile.tasks:
+                items.append(_completion_item(t.model_copy(update={"prefix": prefix})))
+        return items
+
+
+def _required_var_names(task: Task) -> list[str]:
+    vars_list = task.requires.get("vars") if task.requires else None
+    names = []
+    for v in vars_list or []:
+        name = v.get("name", "") if isinstance(v, dict) else str(v)
+        if name:
+            names.append(name)
+    return names
+
+
+def _completion_item(task: Task) -> dict:
+    return {"label": task.gen_command(), "kind": _COMPLETION_KIND_FUNCTION, "detail": task.desc}
@@ -0,0 +1,293 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import time
+from collections.abc import Callable, Generator
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from taskfile_parser.domain.cache import CachedInclude
+from taskfile_parser.exceptions import LockTimeoutError, RemoteFetchError
+from taskfile_parser.repository.filelock import DEFAULT_LOCK_TIMEOUT, FileLock, atomic_write
+from taskfile_parser.repository.loader import DOCUMENT_FORMAT, ByteStream, YamlLimits, dump_document, load_document
+from taskfile_parser.repository.remote import DEFAULT_MAX_REMOTE_BYTES, open_remote_if_modified
+
+CACHE_DIR_ENV = "TASKFILE_PARSER_CACHE_DIR"
+
+# Fetched includes are reused for this long before being revalidated with the server
+DEFAULT_REMOTE_TTL = 300.0
+
+# Entries, blobs and parse results unused for this long are deleted
+DEFAULT_MAX_AGE = 30 * 24 * 3600.0
+
+# How often a process looks for entries to delete
+_PRUNE_INTERVAL = 24 * 3600.0
+
+# Size of the reads when streaming a fetched body to disk
+_CHUNK = 64 * 1024
+
+# Suffix of the file each lock file guards, by cache subdirectory
+_ENTRY_SUFFIXES = {"includes": ".json", "blobs": ".yml", "parsed": ".yml", "fingerprints": ".json"}
+
+
+def default_cache_dir() -> Path:
+    """Return ``$TASKFILE_PARSER_CACHE_DIR``, or ``taskfile-parser`` under the XDG cache directory."""
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "taskfile-parser"
+
+
+def digest(*parts: str | bytes) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        # Length-prefix every part so different splits never hash alike
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+class TaskfileCache:
+    """On-disk cache of fetched remote includes and parsed taskfiles, shared between processes.
+
+    Entries are only ever replaced through an atomic rename, so reading one
+    needs no lock. On a miss the entry's file lock is taken and the entry
+    checked again before doing the work: when parallel invocations start
+    cold, one of them fetches or parses while the others wait and reuse its
+    result. If the lock is not acquired within ``lock_timeout`` the work is
+    done without waiting.
+
+    The cache is only an optimization: when its directory cannot be read
+    or written, work is done as if there were no cache.
+
+    Files not used for ``max_age`` seconds are deleted, checked at most once
+    a day.
+    """
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        remote_ttl: float = DEFAULT_REMOTE_TTL,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.root = Path(root) if root else default_cache_dir()
+        self.remote_ttl = remote_ttl
+        self.lock_timeout = lock_timeout
+        self.max_age = max_age
+        # Work done by this instance rather than reused from the cache
+        self.fetch_count = 0
+        self.parse_count = 0
+        self._prune_checked = False
+
+    @contextlib.contextmanager
+    def _locked(self, path: Path) -> Generator[bool]:
+        """Hold the lock guarding ``path``, yielding ``False`` if it is busy past the timeout or cannot be taken."""
+        lock = FileLock(path.with_suffix(".lock"), self.lock_timeout)
+        try:
+            lock.acquire()
+        except (LockTimeoutError, OSError):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            lock.release()
+
+    def _include_path(self, url: str) -> Path:
+        return self.root / "includes" / f"{digest(url)}.json"
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / f"{sha256}.yml"
+
+    def cached_include(self, url: str) -> CachedInclude | None:
+        """Return the cache entry for ``url``, fresh or not."""
+        try:
+            return CachedInclude.model_validate_json(self._include_path(url).read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+    def _cached(self, url: str) -> CachedInclude | None:
+        """Return the entry for ``url`` if its body is still stored."""
+        entry = self.cached_include(url)
+        if entry is None:
+            return None
+        try:
+            size = self._blob_path(entry.sha256).stat().st_size
+        except OSError:
+            return None
+        # Blobs are named by their hash and written atomically, so the size is enough to catch a stray file
+        return entry if size == entry.size else None
+
+    def _fresh(self, url: str) -> CachedInclude | None:
+        entry = self._cached(url)
+        if entry is None or time.time() - entry.fetched_at >= self.remote_ttl:
+            return None
+        return entry
+
+    def fetch(self, url: str, max_bytes: int = DEFAULT_MAX_REMOTE_BYTES) -> Path | None:
+        """Return the path of the stored body of ``url``, fetching it or revalidating a copy older than ``remote_ttl``.
+
+        Bodies are streamed to disk, so they are never held in memory here.
+        Returns ``None`` if the body cannot be stored, for the caller to
+        fetch it without the cache.
+        """
+        self._prune_if_due()
+        try:
+            entry = self._fresh(url)
+            if entry is None:
+                with self._locked(self._include_path(url)):
+                    # Another process may have fetched it while this one waited
+                    entry = self._fresh(url) or self._refresh(url, max_bytes)
+        except OSError:
+            return None
+        blob_path = self._blob_path(entry.sha256)
+        self._touch(self._include_path(url), blob_path)
+        return blob_path
+
+    def _refresh(self, url: str, max_bytes: int) -> CachedInclude:
+        cached = self._cached(url)
+        with open_remote_if_modified(
+            url,
+            max_bytes,
+            etag=cached.etag if cached is not None else None,
+            last_modified=cached.last_modified if cached is not None else None,
+        ) as (body, headers):
+            self.fetch_count += 1
+            if body is None:
+                if cached is None:
+                    raise RemoteFetchError(f"Unexpected 304 Not Modified without a cached copy: {url}")
+                # 304 Not Modified: keep the body and any validator the server did not resend
+                sha256, size = cached.sha256, cached.size
+                etag = headers.get("ETag", cached.etag)
+                last_modified = headers.get("Last-Modified", cached.last_modified)
+            else:
+                sha256, size = self._write_blob(body)
+                etag = headers.get("ETag")
+                last_modified = headers.get("Last-Modified")
+        entry = CachedInclude(
+            url=url,
+            sha256=sha256,
+            size=size,
+            fetched_at=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        atomic_write(self._include_path(url), entry.model_dump_json().encode("utf-8"))
+        return entry
+
+    def _write_blob(self, body: ByteStream) -> tuple[str, int]:
+        """Stream ``body`` into the blob store and return its SHA-256 and size."""
+        blobs = self.root / "blobs"
+        blobs.mkdir(parents=True, exist_ok=True)
+        h = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=blobs, prefix=".blob.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while chunk := body.read(_CHUNK):
+                    h.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            os.replace(tmp, self._blob_path(h.hexdigest()))
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
+        return h.hexdigest(), size
+
+    def document(
+        self,
+        sha256: str,
+        limits: YamlLimits,
+        load: Callable[[], object],
+        read_source: Callable[[], bytes],
+    ):
+        """Return the YAML document whose source has digest ``sha256``, calling ``load`` only on a miss.
+
+        Documents are stored as YAML, so values keep the types the loader
+        gave them, and deferred task fields are stored as spans that are
+        parsed from ``read_source()`` on first access.
+        """
+        self._prune_if_due()
+        key = digest(DOCUMENT_FORMAT, limits.model_dump_json(), sha256)
+        path = self.root / "parsed" / f"{key}.yml"
+        data = self._read_document(path, read_source)
+        if data is not None:
+            return data
+        with self._locked(path) as locked:
+            # Another process may have stored it while this one waited
+            data = self._read_document(path, read_source) if locked else None
+            if data is None:
+                data = load()
+                self.parse_count += 1
+                if locked:
+                    with contextlib.suppress(OSError):
+                        atomic_write(path, dump_document(data))
+            return data
+
+    def _read_document(self, path: Path, read_source: Callable[[], bytes]):
+        try:
+            dumped = path.read_bytes()
+        except OSError:
+            return None
+        self._touch(path)
+        return load_document(dumped, read_source)
+
+    def _touch(self, *paths: Path) -> None:
+        """Mark ``paths`` as used, so pruning keeps them."""
+        for path in paths:
+            with contextlib.suppress(OSError):
+                os.utime(path)
+
+    def _prune_if_due(self) -> None:
+        if self._prune_checked:
+            return
+        self._prune_checked = True
+        stamp = self.root / "pruned"
+        with contextlib.suppress(OSError):
+            if time.time() - stamp.stat().st_mtime < _PRUNE_INTERVAL:
+                return
+        try:
+            # Whoever takes the lock prunes; nobody waits for it
+            with FileLock(self.root / "prune.lock", timeout=0):
+                self.prune()
+                atomic_write(stamp, b"")
+        except (LockTimeoutError, OSError):
+            pass
+
+    def prune(self) -> int:
+        """Delete cache files not used for ``max_age`` seconds; returns the number removed."""
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for name, suffix in _ENTRY_SUFFIXES.items():
+            directory = self.root / name
+            if not directory.is_dir():
+                continue
+            # Lock files go last, and only once the file they guard is gone
+            for path in sorted(directory.iterdir(), key=lambda p: p.suffix == ".lock"):
+                if path.suffix == ".lock":
+                    removed += self._prune_lock(path, path.with_suffix(suffix), cutoff)
+                    continue
+                with contextlib.suppress(OSError):
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+        return removed
+
+    def _prune_lock(self, path: Path, guarded: Path, cutoff: float) -> int:
+        """Delete the lock file ``path`` if it is old and unused; returns the number removed."""
+        try:
+            if path.stat().st_mtime >= cutoff:
+                return 0
+            # Only a holder may delete a lock file; one in use right now is skipped
+            with FileLock(path, timeout=0):
+                if guarded.exists():
+                    return 0
+                path.unlink()
+                return 1
+        except (LockTimeoutError, OSError):
+            return 0
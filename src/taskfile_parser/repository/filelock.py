@@ -0,0 +1,113 @@
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from taskfile_parser.exceptions import LockTimeoutError
+
+DEFAULT_LOCK_TIMEOUT = 30.0
+
+# Interval between attempts to take a lock held by another process
+_POLL_INTERVAL = 0.02
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _is_current(fd: int, path: Path) -> bool:
+    """Return whether ``fd`` is still the file at ``path``."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(fd)
+    return (st.st_dev, st.st_ino) == (opened.st_dev, opened.st_ino)
+
+
+class FileLock:
+    """Exclusive lock on ``path`` shared between processes.
+
+    The lock file is created on demand. It may only be deleted by a holder
+    of the lock: a process that was waiting on the deleted file notices
+    once it gets the lock, and locks the file now at ``path`` instead.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            while not _try_lock(fd):
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeoutError(f"Timed out after {self.timeout}s waiting for lock: {self.path}")
+                time.sleep(_POLL_INTERVAL)
+            if _is_current(fd, self.path):
+                self._fd = fd
+                return
+            # The file was deleted by its previous holder; lock whichever file is at the path now
+            _unlock(fd)
+            os.close(fd)
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            _unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def atomic_write(path: str | Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` through a temporary file and a rename, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
@@ -0,0 +1,152 @@
+import contextlib
+import hashlib
+import io
+import os
+import time
+from pathlib import Path
+
+import yaml
+from pydantic import RootModel, ValidationError
+
+from taskfile_parser.domain.fingerprint import FileDigest, Fingerprint, FingerprintNode
+from taskfile_parser.exceptions import YamlLimitError
+from taskfile_parser.repository.cache import TaskfileCache, digest
+from taskfile_parser.repository.filelock import atomic_write
+from taskfile_parser.repository.lockfile import RemoteBundle
+from taskfile_parser.repository.remote import is_remote
+from taskfile_parser.repository.repository import TaskFileRepository
+
+# Files modified this recently may change again within the same mtime tick, so their digest is not cached
+_RACY_SECONDS = 2.0
+
+
+class _DigestCache(RootModel[dict[str, FileDigest]]):
+    pass
+
+
+class TaskfileFingerprinter:
+    """Compute a Merkle hash over a taskfile and everything it includes.
+
+    Each local file contributes the SHA-256 of its content and the hashes of
+    its includes, in order. Digests and include lists are cached per root
+    taskfile, keyed by path with the file's mtime and size, so when nothing
+    changed the root hash costs one ``stat`` per file and no reads. Remote
+    includes contribute the hash pinned in the lockfile, or else the hash
+    and validators of the copy in the shared cache; nothing is fetched.
+
+    Local includes are followed recursively even though ``read_tasks`` reads
+    a single level, so the hash changes whenever anything it might read does.
+    """
+
+    def __init__(self, cache: TaskfileCache | None = None):
+        self.cache = cache or TaskfileCache()
+        self._digests: dict[str, FileDigest] = {}
+        self._used: dict[str, FileDigest] = {}
+        # Files read and hashed by this instance rather than reused from the cache
+        self.read_count = 0
+
+    def _digests_path(self, root: Path) -> Path:
+        return self.cache.root / "fingerprints" / f"{digest(str(root))}.json"
+
+    def _load_digests(self, path: Path) -> dict[str, FileDigest]:
+        try:
+            return _DigestCache.model_validate_json(path.read_bytes()).root
+        except (FileNotFoundError, ValidationError):
+            return {}
+
+    def _save_digests(self, path: Path) -> None:
+        # Only files this run visited are kept, so removed includes drop out of the map
+        if self._used == self._digests:
+            # Mark the map as used, so pruning keeps it
+            with contextlib.suppress(OSError):
+                os.utime(path)
+            return
+        # Concurrent runs on the same root write the same tree, so the last writer wins without a lock
+        atomic_write(path, _DigestCache(self._used).model_dump_json().encode("utf-8"))
+
+    def _file_digest(self, path: Path, taskfile: bool = True) -> FileDigest | None:
+        """Return the digest of ``path``, and its includes if it is a ``taskfile``; ``None`` if it is missing."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        key = str(path)
+        cached = self._digests.get(key)
+        if cached is not None and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+            self._used[key] = cached
+            return cached
+
+        content = path.read_bytes()
+        self.read_count += 1
+        includes = []
+        if taskfile:
+            try:
+                includes = TaskFileRepository._read_from_content(io.BytesIO(content)).includes
+            except (yaml.YAMLError, YamlLimitError, AttributeError, TypeError, ValueError):
+                # A broken taskfile still changes the hash through its content
+                pass
+        file_digest = FileDigest(
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            sha256=hashlib.sha256(content).hexdigest(),
+            includes=includes,
+        )
+        if time.time() - st.st_mtime > _RACY_SECONDS:
+            self._used[key] = file_digest
+        return file_digest
+
+    def _remote_hash(self, url: str, lockfile: FileDigest | None) -> str:
+        parts = ["remote", url]
+        if lockfile is not None:
+            # Any change to the lockfile may change what is served from the bundle
+            parts += ["locked", lockfile.sha256]
+        entry = self.cache.cached_include(url)
+        if entry is not None:
+            parts += ["cached", entry.sha256, entry.etag or "", entry.last_modified or ""]
+        return digest(*parts)
+
+    def _node_hash(
+        self,
+        path: Path,
+        lockfile: FileDigest | None,
+        nodes: dict[str, str],
+        visiting: set[str],
+    ) -> str:
+        key = str(path)
+        if key in nodes:
+            return nodes[key]
+        if key in visiting:
+            return digest("cycle", key)
+        file_digest = self._file_digest(path)
+        if file_digest is None:
+            return digest("missing", key)
+
+        visiting.add(key)
+        parts = ["taskfile", file_digest.sha256]
+        for i in file_digest.includes:
+            if is_remote(i.taskfile):
+                child = self._remote_hash(i.taskfile, lockfile)
+                nodes.setdefault(i.taskfile, child)
+            else:
+                child = self._node_hash(Path(os.path.normpath(path.parent / i.taskfile)), lockfile, nodes, visiting)
+            parts += [i.prefix, child]
+        visiting.discard(key)
+        nodes[key] = digest(*parts)
+        return nodes[key]
+
+    def fingerprint(self, taskfile_path: str) -> Fingerprint:
+        """Return the Merkle hash of ``taskfile_path`` and its include tree."""
+        path = Path(os.path.abspath(taskfile_path))
+        digests_path = self._digests_path(path)
+        self._digests = self._load_digests(digests_path)
+        self._used = {}
+        lockfile = self._file_digest(RemoteBundle.for_taskfile(str(path)).lockfile_path, taskfile=False)
+        nodes: dict[str, str] = {}
+        # The file name matters too, since TaskfileFinder picks among several candidates
+        root_hash = digest(path.name, self._node_hash(path, lockfile, nodes, set()))
+        self._save_digests(digests_path)
+        return Fingerprint(
+            root=str(path),
+            sha256=root_hash,
+            nodes=[FingerprintNode(source=source, sha256=sha256) for source, sha256 in nodes.items()],
+        )
@@ -0,0 +1,180 @@
+import posixpath
+import subprocess
+from pathlib import Path
+
+import yaml
+
+from taskfile_parser.domain.history import CatalogDiff, TaskChange
+from taskfile_parser.domain.taskfile import Task, Taskfile
+from taskfile_parser.exceptions import YamlLimitError
+from taskfile_parser.repository.remote import is_remote
+from taskfile_parser.repository.repository import TASKFILE_CANDIDATES, TaskFileRepository
+
+# Fields compared between revisions; name and prefix are part of the command itself
+_COMPARED_FIELDS = ["desc", "requires", "aliases", "deps", "vars"]
+
+
+class GitCatFile:
+    """A long-lived ``git cat-file --batch`` process for reading blobs by ``<rev>:<path>``."""
+
+    def __init__(self, repo_dir: str):
+        self.repo_dir = repo_dir
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, spec: str) -> tuple[str, bytes] | None:
+        """Return ``(oid, content)`` for a blob, or ``None`` if ``spec`` is missing or not a blob."""
+        stdin, stdout = self._process.stdin, self._process.stdout
+        if stdin is None or stdout is None:
+            raise RuntimeError("git cat-file process is closed")
+        stdin.write(spec.encode("utf-8") + b"\n")
+        stdin.flush()
+        header = stdout.readline().decode("utf-8").rstrip("\n")
+        # "<spec> missing" or "<spec> ambiguous"; the spec itself may contain spaces
+        if header.endswith((" missing", " ambiguous")):
+            return None
+        fields = header.rsplit(" ", 2)
+        if len(fields) != 3 or not fields[2].isdigit():
+            raise RuntimeError(f"Unexpected git cat-file header for {spec!r}: {header!r}")
+        oid, kind, size = fields
+        content = stdout.read(int(size))
+        stdout.read(1)  # trailing newline
+        if kind != "blob":
+            return None
+        return oid, content
+
+    def close(self) -> None:
+        if self._process.stdin is not None:
+            self._process.stdin.close()
+        self._process.wait()
+
+    def __enter__(self) -> "GitCatFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TaskfileHistory:
+    """Read task catalogs of many revisions without checking them out.
+
+    Taskfile blobs are read through one ``git cat-file --batch`` process and
+    each distinct blob is parsed once, keyed by its object id.
+    """
+
+    def __init__(self, repo_dir: str):
+        self.repo_dir = Path(repo_dir)
+        toplevel = self._git("rev-parse", "--show-toplevel")
+        # Path of repo_dir inside the work tree, so the root Taskfile is looked up at the same place
+        self.subdir = Path(repo_dir).resolve().relative_to(Path(toplevel).resolve()).as_posix()
+        self._cat_file: GitCatFile | None = None
+        self._parsed: dict[str, Taskfile] = {}
+        self.parse_count = 0
+
+    def _git(self, *args: str) -> str:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=self.repo_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return completed.stdout.strip()
+
+    def _cat(self) -> GitCatFile:
+        if self._cat_file is None:
+            self._cat_file = GitCatFile(str(self.repo_dir))
+        return self._cat_file
+
+    def close(self) -> None:
+        if self._cat_file is not None:
+            self._cat_file.close()
+            self._cat_file = None
+
+    def __enter__(self) -> "TaskfileHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def revisions(self, rev_range: str = "HEAD", max_count: int | None = None) -> list[str]:
+        """Return commit ids in ``rev_range`` from oldest to newest."""
+        args = ["rev-list", "--first-parent"]
+        if max_count is not None:
+            args.append(f"--max-count={max_count}")
+        out = self._git(*args, rev_range, "--")
+        return list(reversed(out.split())) if out else []
+
+    def _parse(self, oid: str, content: bytes) -> Taskfile:
+        taskfile = self._parsed.get(oid)
+        if taskfile is None:
+            try:
+                # Diffs compare deps and vars of every task, so load them eagerly
+                taskfile = TaskFileRepository._read_from_content(content.decode("utf-8"), lazy=False)
+            except (yaml.YAMLError, YamlLimitError, UnicodeDecodeError, AttributeError, TypeError, ValueError):
+                # A revision with a broken Taskfile contributes no tasks
+                taskfile = Taskfile(includes=[], tasks=[])
+            self._parsed[oid] = taskfile
+            self.parse_count += 1
+        return taskfile
+
+    def _path(self, *parts: str) -> str:
+        path = posixpath.normpath(posixpath.join(self.subdir, *parts))
+        return "" if path == "." else path
+
+    def read_catalog(self, revision: str) -> dict[str, Task]:
+        """Return the tasks of ``revision`` keyed by command; remote includes are skipped."""
+        cat = self._cat()
+        root = None
+        for candidate in TASKFILE_CANDIDATES:
+            root_path = self._path(candidate)
+            root = cat.read(f"{revision}:{root_path}")
+            if root is not None:
+                break
+        if root is None:
+            return {}
+
+        base_taskfile = self._parse(*root)
+        tasks = list(base_taskfile.tasks)
+        for i in base_taskfile.includes:
+            if is_remote(i.taskfile):
+                continue
+            include_path = posixpath.normpath(posixpath.join(posixpath.dirname(root_path), i.taskfile))
+            blob = cat.read(f"{revision}:{include_path}")
+            if blob is None:
+                continue
+            tasks.extend(t.model_copy(update={"prefix": i.prefix}) for t in self._parse(*blob).tasks)
+        return {t.gen_command(): t for t in tasks}
+
+    def diffs(self, revisions: list[str]) -> list[CatalogDiff]:
+        """Diff the catalog of each revision against the previous one in ``revisions``."""
+        result = []
+        previous: dict[str, Task] = {}
+        parent = None
+        for revision in revisions:
+            catalog = self.read_catalog(revision)
+            result.append(diff_catalogs(revision, parent, previous, catalog))
+            previous, parent = catalog, revision
+        return result
+
+
+def diff_catalogs(revision: str, parent: str | None, old: dict[str, Task], new: dict[str, Task]) -> CatalogDiff:
+    changed: list[TaskChange] = []
+    for command in old.keys() & new.keys():
+        if old[command] is new[command]:
+            continue
+        fields = [f for f in _COMPARED_FIELDS if getattr(old[command], f) != getattr(new[command], f)]
+        if fields:
+            changed.append(TaskChange(command=command, fields=fields))
+    changed.sort(key=lambda c: c.command)
+    return CatalogDiff(
+        revision=revision,
+        parent=parent,
+        added=sorted(new.keys() - old.keys()),
+        removed=sorted(old.keys() - new.keys()),
+        changed=changed,
+    )
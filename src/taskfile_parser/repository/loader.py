@@ -0,0 +1,349 @@
+import codecs
+from collections import deque
+from collections.abc import Callable, Collection
+from typing import TYPE_CHECKING, Protocol
+
+import yaml
+from pydantic import BaseModel
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+
+from taskfile_parser.domain.taskfile import LazyValue
+from taskfile_parser.exceptions import YamlLimitError
+
+
+class YamlLimits(BaseModel):
+    # Size of the YAML source in bytes
+    max_bytes: int
+    # Nodes in the document, counting every node reached through an alias again
+    max_nodes: int
+    # Alias references (`*name`) in the document
+    max_aliases: int
+    # Nesting depth of sequences and mappings
+    max_depth: int
+
+
+DEFAULT_LOCAL_LIMITS = YamlLimits(max_bytes=16 * 1024 * 1024, max_nodes=2_000_000, max_aliases=100_000, max_depth=200)
+DEFAULT_REMOTE_LIMITS = YamlLimits(max_bytes=2 * 1024 * 1024, max_nodes=200_000, max_aliases=1_000, max_depth=64)
+
+
+class ByteStream(Protocol):
+    """Binary stream read in chunks, such as an open file or a :class:`RemoteBody`."""
+
+    def read(self, size: int = -1, /) -> bytes: ...
+
+
+# Tag of the placeholder nodes standing in for deferred values
+DEFERRED_TAG = "tag:taskfile-parser,2024:deferred"
+
+# Deferred values are small and already checked, so they skip the limits
+_FAST_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_FAST_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _position(mark: yaml.Mark | None) -> str:
+    if mark is None:
+        return ""
+    return f" at line {mark.line + 1}, column {mark.column + 1}"
+
+
+class _LimitedStream:
+    """Binary stream wrapper that stops reading once ``max_bytes`` is exceeded.
+
+    With ``record``, the bytes read are kept in ``chunks`` so deferred values
+    can be sliced out of the source later.
+    """
+
+    def __init__(self, stream: ByteStream, max_bytes: int, record: bool = False):
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self._read = 0
+        self.chunks: list[bytes] | None = [] if record else None
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._read += len(data)
+        if self._read > self._max_bytes:
+            raise YamlLimitError(f"YAML input exceeds {self._max_bytes} bytes")
+        if self.chunks is not None:
+            self.chunks.append(data)
+        return data
+
+
+class _Source:
+    """Text of a loaded document, decoded on first use."""
+
+    def __init__(
+        self,
+        text: str | None = None,
+        chunks: list[bytes] | None = None,
+        counts_bom: bool = False,
+        read: Callable[[], bytes] | None = None,
+    ):
+        self._text = text
+        self._chunks = chunks
+        # Reads the raw source when it is not recorded in chunks
+        self._read = read
+        # The pure Python reader counts a byte order mark in mark indexes, libyaml does not
+        self._counts_bom = counts_bom
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            raw = self._read() if self._read is not None else b"".join(self._chunks or [])
+            self._chunks = self._read = None
+            if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                # Decoding UTF-16 drops the byte order mark; keep it like the UTF-8 path does
+                self._text = "\ufeff" + raw.decode("utf-16")
+            else:
+                self._text = raw.decode("utf-8")
+        if not self._counts_bom and self._text.startswith("\ufeff"):
+            self._text = self._text[1:]
+        return self._text
+
+
+class DeferredValue(LazyValue):
+    """A mapping value that was skipped while composing and is parsed from its source span on demand."""
+
+    __slots__ = ("source", "start", "end", "column")
+
+    def __init__(self, source: _Source, start: int, end: int, column: int):
+        self.source = source
+        # Span from the key to the end of the value, so block scalars keep their indentation
+        self.start = start
+        self.end = end
+        self.column = column
+
+    def load(self) -> object:
+        text = " " * self.column + self.source.text[self.start : self.end]
+        # The span was already checked against the limits and holds no aliases
+        data = yaml.load(text, Loader=_FAST_LOADER)
+        return next(iter(data.values()))
+
+
+# Type checkers see the pure Python loader only; both variants provide the same interface
+if TYPE_CHECKING or not yaml.__with_libyaml__:
+
+    class _ComposingLoader(yaml.SafeLoader):
+        """Pure Python safe loader, used when PyYAML is built without libyaml."""
+
+        counts_bom = True
+
+else:
+    from yaml.cyaml import CParser
+
+    class _ComposingLoader(Composer, CParser, SafeConstructor, Resolver):
+        """Safe loader that parses with libyaml but composes nodes in Python, so composing can be hooked."""
+
+        counts_bom = False
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+
+class LimitedSafeLoader(_ComposingLoader):
+    """Safe loader that enforces :class:`YamlLimits` while composing nodes.
+
+    Limits are checked as events are composed, so an alias bomb is rejected
+    before any Python objects are constructed from it.
+
+    Values of the task keys listed in ``deferred_task_fields`` are not
+    composed at all: their events are only counted against the limits and
+    they load as :class:`DeferredValue`, parsed from the source on demand.
+    """
+
+    def __init__(
+        self,
+        stream: str | ByteStream,
+        limits: YamlLimits,
+        deferred_task_fields: Collection[str] = (),
+    ):
+        if isinstance(stream, str):
+            size = len(stream.encode("utf-8"))
+            if size > limits.max_bytes:
+                raise YamlLimitError(f"YAML input exceeds {limits.max_bytes} bytes ({size} bytes)")
+            self.source = _Source(text=stream, counts_bom=self.counts_bom)
+            reader: str | ByteStream = stream
+        else:
+            limited = _LimitedStream(stream, limits.max_bytes, record=bool(deferred_task_fields))
+            self.source = _Source(chunks=limited.chunks, counts_bom=self.counts_bom)
+            reader = limited
+        super().__init__(reader)
+        self.limits = limits
+        self._nodes = 0
+        self._aliases = 0
+        self._depth = 0
+        # Expanded size of every composed node, so aliases can be charged for what they expand to
+        self._weights: dict[int, int] = {}
+        self._deferred = frozenset(deferred_task_fields)
+        # Keys leading to the collection being composed, e.g. [None, "tasks", "build"]
+        self._keys: list[str | None] = []
+
+    def _charge(self, weight: int, mark: yaml.Mark | None) -> None:
+        self._nodes += weight
+        if self._nodes > self.limits.max_nodes:
+            raise YamlLimitError(f"YAML document exceeds {self.limits.max_nodes} nodes{_position(mark)}")
+
+    def compose_node(self, parent, index):
+        event = self.peek_event()
+        if isinstance(event, yaml.AliasEvent):
+            self._aliases += 1
+            if self._aliases > self.limits.max_aliases:
+                raise YamlLimitError(
+                    f"YAML document exceeds {self.limits.max_aliases} aliases{_position(event.start_mark)}"
+                )
+            node = super().compose_node(parent, index)
+            # A recursive alias refers to a node still being composed; charge it once
+            self._charge(self._weights.get(id(node), 1), event.start_mark)
+            return node
+
+        if (
+            self._deferred
+            and len(self._keys) == 3
+            and self._keys[1] == "tasks"
+            and isinstance(index, yaml.ScalarNode)
+            and index.value in self._deferred
+            and not parent.flow_style
+            # An explicit `? key` starts right of its mapping; its span would not parse on its own
+            and index.start_mark.column == parent.start_mark.column
+        ):
+            node = self._compose_deferred(index)
+            if node is not None:
+                return node
+            event = self.peek_event()
+
+        collection = isinstance(event, yaml.CollectionStartEvent)
+        if collection:
+            self._depth += 1
+            if self._depth > self.limits.max_depth:
+                raise YamlLimitError(
+                    f"YAML document exceeds depth {self.limits.max_depth}{_position(event.start_mark)}"
+                )
+            self._keys.append(index.value if isinstance(index, yaml.ScalarNode) else None)
+        nodes_before = self._nodes
+        self._charge(1, event.start_mark)
+        node = super().compose_node(parent, index)
+        if collection:
+            self._depth -= 1
+            self._keys.pop()
+        self._weights[id(node)] = self._nodes - nodes_before
+        return node
+
+    def _compose_deferred(self, key: yaml.ScalarNode) -> yaml.Node | None:
+        """Count the events of the value of ``key`` against the limits without composing it.
+
+        Returns ``None`` when the value defines or refers to an anchor, since
+        other nodes may depend on it; its events are then replayed so it is
+        composed as usual.
+        """
+        nodes_before = self._nodes
+        events = []
+        depth = 0
+        while True:
+            event = self.get_event()
+            events.append(event)
+            if isinstance(event, yaml.AliasEvent) or getattr(event, "anchor", None) is not None:
+                self._nodes = nodes_before
+                self._replay(events)
+                return None
+            if isinstance(event, yaml.CollectionStartEvent):
+                depth += 1
+                if self._depth + depth > self.limits.max_depth:
+                    raise YamlLimitError(
+                        f"YAML document exceeds depth {self.limits.max_depth}{_position(event.start_mark)}"
+                    )
+                self._charge(1, event.start_mark)
+            elif isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+            else:
+                self._charge(1, event.start_mark)
+            if depth == 0:
+                break
+        assert key.start_mark is not None and event.end_mark is not None
+        value = DeferredValue(self.source, key.start_mark.index, event.end_mark.index, key.start_mark.column)
+        return yaml.ScalarNode(DEFERRED_TAG, value, events[0].start_mark, event.end_mark)
+
+    def _replay(self, events: list[yaml.Event]) -> None:
+        """Serve ``events`` again before resuming the parser."""
+        pending = deque(events)
+
+        def check_event(*choices):
+            return not choices or isinstance(pending[0], choices)
+
+        def peek_event():
+            return pending[0]
+
+        def get_event():
+            event = pending.popleft()
+            if not pending:
+                for name in ("check_event", "peek_event", "get_event"):
+                    del self.__dict__[name]
+            return event
+
+        # Instance attributes shadow the parser methods only while replaying
+        self.__dict__.update(check_event=check_event, peek_event=peek_event, get_event=get_event)
+
+
+LimitedSafeLoader.add_constructor(DEFERRED_TAG, lambda loader, node: node.value)
+
+
+def load_yaml(content: str | ByteStream, limits: YamlLimits, deferred_task_fields: Collection[str] = ()):
+    """Load the first document of ``content`` within ``limits``.
+
+    Values of the task keys in ``deferred_task_fields`` load as
+    :class:`DeferredValue` instead of being constructed.
+    """
+    loader = LimitedSafeLoader(content, limits, deferred_task_fields)
+    try:
+        return loader.get_data() if loader.check_data() else None
+    finally:
+        loader.dispose()
+
+
+# Identifies documents written by dump_document; deferred spans depend on how the parser counts a byte order mark
+DOCUMENT_FORMAT = f"1-{'bom' if LimitedSafeLoader.counts_bom else 'nobom'}"
+
+
+class _DocumentDumper(_FAST_DUMPER):
+    pass
+
+
+_DocumentDumper.add_representer(
+    DeferredValue,
+    lambda dumper, value: dumper.represent_sequence(
+        DEFERRED_TAG, [value.start, value.end, value.column], flow_style=True
+    ),
+)
+
+
+class _DocumentLoader(_FAST_LOADER):
+    def __init__(self, stream, source: _Source):
+        super().__init__(stream)
+        self.source = source
+
+
+_DocumentLoader.add_constructor(
+    DEFERRED_TAG, lambda loader, node: DeferredValue(loader.source, *loader.construct_sequence(node))
+)
+
+
+def dump_document(data) -> bytes:
+    """Serialize a document returned by :func:`load_yaml`, storing deferred values as their spans.
+
+    The output is YAML, so every value loads back with the type the safe
+    constructor gave it.
+    """
+    return yaml.dump(data, Dumper=_DocumentDumper, sort_keys=False, allow_unicode=True, encoding="utf-8")
+
+
+def load_document(dumped: bytes, read_source: Callable[[], bytes]):
+    """Load the output of :func:`dump_document`; deferred values are parsed from ``read_source()`` on first access."""
+    loader = _DocumentLoader(dumped, _Source(counts_bom=LimitedSafeLoader.counts_bom, read=read_source))
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
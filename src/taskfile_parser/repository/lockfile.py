@@ -0,0 +1,98 @@
+import hashlib
+from pathlib import Path
+
+from taskfile_parser.domain.lockfile import LockedInclude, Lockfile
+from taskfile_parser.exceptions import LockfileError
+from taskfile_parser.repository.filelock import FileLock, atomic_write
+from taskfile_parser.repository.remote import DEFAULT_MAX_REMOTE_BYTES, fetch_remote
+
+LOCKFILE_NAME = "Taskfile.lock.json"
+BUNDLE_DIR_NAME = ".taskfile-bundle"
+
+
+class RemoteBundle:
+    """Serve remote includes from a vendored bundle pinned by a lockfile.
+
+    Each locked URL is stored in ``bundle_dir`` under its SHA-256 digest, so
+    reading an include never touches the network and every read is verified
+    against the hash and size recorded in the lockfile.
+    """
+
+    def __init__(self, lockfile_path: str, bundle_dir: str | None = None, frozen: bool = False):
+        self.lockfile_path = Path(lockfile_path)
+        self.bundle_dir = Path(bundle_dir) if bundle_dir else self.lockfile_path.parent / BUNDLE_DIR_NAME
+        self.frozen = frozen
+        self._lockfile: Lockfile | None = None
+
+    @classmethod
+    def for_taskfile(cls, taskfile_path: str, frozen: bool = False) -> "RemoteBundle":
+        """Return the bundle that sits next to ``taskfile_path``."""
+        return cls(lockfile_path=str(Path(taskfile_path).parent / LOCKFILE_NAME), frozen=frozen)
+
+    def exists(self) -> bool:
+        return self.lockfile_path.exists()
+
+    def load(self) -> Lockfile:
+        if self._lockfile is None:
+            if not self.exists():
+                raise LockfileError(f"Lockfile not found: {self.lockfile_path}")
+            with open(self.lockfile_path, encoding="utf-8") as f:
+                self._lockfile = Lockfile.model_validate_json(f.read())
+        return self._lockfile
+
+    def lock(self, urls: list[str], max_bytes: int = DEFAULT_MAX_REMOTE_BYTES) -> Lockfile:
+        """Fetch every URL, vendor the bodies and write the lockfile.
+
+        Concurrent ``lock`` runs on the same lockfile take turns, and every
+        file is replaced atomically so readers see either version in full.
+        """
+        with FileLock(self.lockfile_path.with_name(f".{self.lockfile_path.name}.lock")):
+            includes = []
+            for url in sorted(set(urls)):
+                body = fetch_remote(url, max_bytes)
+                digest = hashlib.sha256(body).hexdigest()
+                atomic_write(self.bundle_dir / f"{digest}.yml", body)
+                includes.append(LockedInclude(url=url, sha256=digest, size=len(body)))
+
+            lockfile = Lockfile(includes=includes)
+            atomic_write(self.lockfile_path, (lockfile.model_dump_json(indent=2) + "\n").encode("utf-8"))
+        self._lockfile = lockfile
+        return lockfile
+
+    def read(self, url: str) -> str | None:
+        """Return the vendored body for ``url``.
+
+        Returns ``None`` when ``url`` is not locked so the caller can fall back
+        to the network, unless the bundle is frozen.
+        """
+        locked = self.load().get(url)
+        if locked is None:
+            if self.frozen:
+                raise LockfileError(f"Remote include is not locked: {url}")
+            return None
+        return self._verified_body(locked).decode("utf-8")
+
+    def stale_urls(self, urls: list[str]) -> list[str]:
+        """Return URLs whose lock entry is missing, extra or fails verification."""
+        if not self.exists():
+            return sorted(set(urls))
+        lockfile = self.load()
+        stale = set(urls).symmetric_difference(lockfile.urls())
+        for locked in lockfile.includes:
+            if locked.url in stale:
+                continue
+            try:
+                self._verified_body(locked)
+            except LockfileError:
+                stale.add(locked.url)
+        return sorted(stale)
+
+    def _verified_body(self, locked: LockedInclude) -> bytes:
+        path = self.bundle_dir / f"{locked.sha256}.yml"
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            raise LockfileError(f"Bundled include is missing for {locked.url}: {path}") from None
+        if len(body) != locked.size or hashlib.sha256(body).hexdigest() != locked.sha256:
+            raise LockfileError(f"Bundled include failed integrity check for {locked.url}: {path}")
+        return body
@@ -0,0 +1,134 @@
+import zlib
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+
+import httpx
+
+from taskfile_parser.exceptions import RemoteFetchError
+
+# Taskfiles are small; anything larger is almost certainly a misconfigured URL
+DEFAULT_MAX_REMOTE_BYTES = 2 * 1024 * 1024
+
+# Upper bound on the output of a single decompression step
+_DECOMPRESS_CHUNK = 64 * 1024
+
+
+def is_remote(taskfile: str) -> bool:
+    return taskfile.startswith("https://")
+
+
+class _Decompressor:
+    """Incrementally decode a response body, never inflating more than one chunk at a time."""
+
+    def __init__(self, url: str, encoding: str):
+        self.url = url
+        if encoding in ("", "identity"):
+            self._obj = None
+        elif encoding in ("gzip", "x-gzip", "deflate"):
+            # Accept both gzip and zlib headers
+            self._obj = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        else:
+            raise RemoteFetchError(f"Unsupported Content-Encoding {encoding!r} for {url}")
+
+    def decode(self, data: bytes) -> Iterator[bytes]:
+        if self._obj is None:
+            yield data
+            return
+        try:
+            yield self._obj.decompress(data, _DECOMPRESS_CHUNK)
+            while self._obj.unconsumed_tail:
+                yield self._obj.decompress(self._obj.unconsumed_tail, _DECOMPRESS_CHUNK)
+        except zlib.error as e:
+            raise RemoteFetchError(f"Failed to decompress {self.url}: {e}") from None
+
+    def flush(self) -> bytes:
+        return self._obj.flush() if self._obj is not None else b""
+
+
+class RemoteBody:
+    """Read-only, size-capped binary stream over a decoded response body.
+
+    PyYAML reads file-like objects in chunks and decodes them incrementally,
+    so the body is never held in memory as a single string.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+        self._offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            data = self._buffer[self._offset :] + b"".join(self._chunks)
+            self._buffer, self._offset = b"", 0
+            return data
+        while len(self._buffer) - self._offset < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer = self._buffer[self._offset :] + chunk
+            self._offset = 0
+        data = self._buffer[self._offset : self._offset + size]
+        self._offset += len(data)
+        return data
+
+
+def _iter_body(response: httpx.Response, url: str, max_bytes: int) -> Iterator[bytes]:
+    decompressor = _Decompressor(url, response.headers.get("Content-Encoding", "").strip().lower())
+    total = 0
+    for raw in response.iter_raw():
+        for chunk in decompressor.decode(raw):
+            total += len(chunk)
+            if total > max_bytes:
+                raise RemoteFetchError(f"Remote include exceeds {max_bytes} bytes: {url}")
+            yield chunk
+    tail = decompressor.flush()
+    if total + len(tail) > max_bytes:
+        raise RemoteFetchError(f"Remote include exceeds {max_bytes} bytes: {url}")
+    yield tail
+
+
+def _check_response(response: httpx.Response, url: str, max_bytes: int) -> None:
+    response.raise_for_status()
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit() and int(length) > max_bytes:
+        raise RemoteFetchError(f"Remote include exceeds {max_bytes} bytes (Content-Length {length}): {url}")
+
+
+@contextmanager
+def open_remote(url: str, max_bytes: int = DEFAULT_MAX_REMOTE_BYTES) -> Generator[RemoteBody]:
+    """Stream a remote taskfile, rejecting bodies larger than ``max_bytes`` once decoded."""
+    with httpx.stream("GET", url, headers={"Accept-Encoding": "gzip, deflate"}) as response:
+        _check_response(response, url, max_bytes)
+        yield RemoteBody(_iter_body(response, url, max_bytes))
+
+
+def fetch_remote(url: str, max_bytes: int = DEFAULT_MAX_REMOTE_BYTES) -> bytes:
+    """Fetch a remote taskfile and return its decoded body."""
+    with open_remote(url, max_bytes) as body:
+        return body.read()
+
+
+@contextmanager
+def open_remote_if_modified(
+    url: str,
+    max_bytes: int = DEFAULT_MAX_REMOTE_BYTES,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> Generator[tuple[RemoteBody | None, httpx.Headers]]:
+    """Stream a remote taskfile unless the copy identified by ``etag`` or ``last_modified`` is still current.
+
+    Yields the decoded body, or ``None`` when the server answers
+    ``304 Not Modified``, together with the response headers.
+    """
+    headers = {"Accept-Encoding": "gzip, deflate"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    with httpx.stream("GET", url, headers=headers) as response:
+        if response.status_code == 304 and (etag or last_modified):
+            yield None, response.headers
+            return
+        _check_response(response, url, max_bytes)
+        yield RemoteBody(_iter_body(response, url, max_bytes)), response.headers
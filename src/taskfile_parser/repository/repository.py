@@ -1,75 +1,225 @@
+import contextlib
+import hashlib
+import io
+from collections.abc import Callable
 from pathlib import Path
 
 import httpx
-import yaml
 
-from taskfile_parser.domain.taskfile import Include, Task, Taskfile
+from taskfile_parser.domain.taskfile import LAZY_FIELDS, Include, Task, Taskfile
+from taskfile_parser.repository.cache import TaskfileCache
+from taskfile_parser.repository.loader import (
+    DEFAULT_LOCAL_LIMITS,
+    DEFAULT_REMOTE_LIMITS,
+    ByteStream,
+    YamlLimits,
+    load_yaml,
+)
+from taskfile_parser.repository.lockfile import RemoteBundle
+from taskfile_parser.repository.remote import DEFAULT_MAX_REMOTE_BYTES, is_remote, open_remote
+from taskfile_parser.repository.vars import ScopedTask, ShellVarEvaluator, VarScope, resolve_vars
+
+TASKFILE_CANDIDATES = [
+    "taskfile.yaml",
+    "taskfile.yml",
+    "Taskfile.yaml",
+    "Taskfile.yml",
+]
 
 
 class TaskFileRepository:
-    def __init__(self, path: str | None = None, prefix: str | None = None):
+    def __init__(
+        self,
+        path: str | None = None,
+        prefix: str | None = None,
+        bundle: RemoteBundle | None = None,
+        max_remote_bytes: int = DEFAULT_MAX_REMOTE_BYTES,
+        resolve_vars: bool = False,
+        evaluator: ShellVarEvaluator | None = None,
+        local_limits: YamlLimits = DEFAULT_LOCAL_LIMITS,
+        remote_limits: YamlLimits = DEFAULT_REMOTE_LIMITS,
+        cache: TaskfileCache | None = None,
+    ):
         self.path = Path(path) if path else None
         self.prefix = prefix
+        self.bundle = bundle
+        self.max_remote_bytes = max_remote_bytes
+        self.resolve_vars = resolve_vars
+        self.evaluator = evaluator
+        self.local_limits = local_limits
+        self.remote_limits = remote_limits
+        self.cache = cache
+        # Tasks of the last read_tasks call with the scopes their variables resolve in
+        self._scoped_tasks: list[ScopedTask] = []
 
     @classmethod
-    def _read_from_content(cls, content: str, prefix: str | None = None) -> Taskfile:
-        """Read and parse taskfile from string content."""
-        docs = list(yaml.safe_load_all(content))
+    def _read_from_content(
+        cls,
+        content: str | ByteStream,
+        prefix: str | None = None,
+        limits: YamlLimits = DEFAULT_LOCAL_LIMITS,
+        lazy: bool = True,
+    ) -> Taskfile:
+        """Read and parse taskfile from string content or a binary stream.
+
+        With ``lazy``, task ``cmds``, ``summary``, ``deps`` and ``vars`` are
+        parsed from the source only when first accessed.
+        """
+        return cls._read_from_data(load_yaml(content, limits, LAZY_FIELDS if lazy else ()), prefix)
 
+    @classmethod
+    def _read_from_data(cls, data: dict, prefix: str | None = None) -> Taskfile:
+        """Build a taskfile from an already loaded YAML document."""
         includes = []
-        for k, v in docs[0].get("includes", {}).items():
+        for k, v in data.get("includes", {}).items():
             if isinstance(v, str):
                 i = Include(prefix=k, taskfile=v)
                 includes.append(i)
             elif isinstance(v, dict):
-                i = Include(prefix=k, taskfile=v.get("taskfile", ""))
+                i = Include(prefix=k, taskfile=v.get("taskfile", ""), vars=v.get("vars") or {}, dir=v.get("dir"))
                 includes.append(i)
 
         tasks = []
-        for k, v in docs[0].get("tasks", {}).items():
+        for k, v in data.get("tasks", {}).items():
             t = Task(
                 prefix=prefix,
                 name=k,
                 desc=v.get("desc", ""),
                 requires=v.get("requires", {}),
+                aliases=[str(a) for a in v.get("aliases") or []],
+                **{f: v[f] for f in LAZY_FIELDS if f in v},
             )
             tasks.append(t)
-        return Taskfile(includes=includes, tasks=tasks)
+        return Taskfile(includes=includes, tasks=tasks, vars=data.get("vars") or {})
+
+    def _read_cached(
+        self,
+        sha256: str,
+        prefix: str | None,
+        limits: YamlLimits,
+        open_content: Callable[[], contextlib.AbstractContextManager[ByteStream]],
+        read_content: Callable[[], bytes],
+    ) -> Taskfile:
+        """Parse the content with digest ``sha256`` through the shared cache.
+
+        ``open_content`` streams the content into the parser on a miss;
+        ``read_content`` supplies it to lazily loaded fields on a hit.
+        """
+        assert self.cache is not None
+
+        def load():
+            with open_content() as stream:
+                return load_yaml(stream, limits, LAZY_FIELDS)
+
+        return self._read_from_data(self.cache.document(sha256, limits, load, read_content), prefix)
+
+    def _read_bytes(self, content: bytes, prefix: str | None, limits: YamlLimits) -> Taskfile:
+        """Parse ``content``, through the shared cache if there is one."""
+        if self.cache is None:
+            return self._read_from_content(io.BytesIO(content), prefix, limits)
+        return self._read_cached(
+            hashlib.sha256(content).hexdigest(),
+            prefix,
+            limits,
+            lambda: io.BytesIO(content),
+            lambda: content,
+        )
 
     def _read(self, content: str | None = None) -> Taskfile:
         if content is not None:
-            return self._read_from_content(content, self.prefix)
+            return self._read_from_content(content, self.prefix, self.local_limits)
         else:
             if self.path is None:
                 raise ValueError("Path must be provided when reading from file")
-            with open(self.path, encoding="utf-8") as f:
-                content = f.read()
-            return self._read_from_content(content, self.prefix)
+            with open(self.path, "rb") as f:
+                if self.cache is not None:
+                    # Read one byte past the limit so oversized files still fail to parse
+                    return self._read_bytes(f.read(self.local_limits.max_bytes + 1), self.prefix, self.local_limits)
+                return self._read_from_content(f, self.prefix, self.local_limits)
+
+    def remote_urls(self) -> list[str]:
+        """Return the URLs of the remote includes of this taskfile."""
+        return [i.taskfile for i in self._read().includes if is_remote(i.taskfile)]
+
+    def _read_remote_template(self, url: str) -> Taskfile | None:
+        """Read a remote include without a prefix; returns ``None`` if it cannot be fetched or parsed."""
+        # Serve from the vendored bundle when the include is locked
+        bundled = self.bundle.read(url) if self.bundle is not None else None
+        if bundled is not None:
+            return self._read_bytes(bundled.encode("utf-8"), None, self.remote_limits)
+        try:
+            # Share the fetched body and the parse result with concurrent invocations
+            blob = self.cache.fetch(url, self.max_remote_bytes) if self.cache is not None else None
+            if blob is not None:
+                # Blobs are named by their digest and never rewritten, so the source can be read later
+                return self._read_cached(blob.stem, None, self.remote_limits, lambda: open(blob, "rb"), blob.read_bytes)
+            # Stream remote taskfile via HTTP GET straight into the YAML parser
+            with open_remote(url, self.max_remote_bytes) as body:
+                return TaskFileRepository._read_from_content(body, None, self.remote_limits)
+        except (httpx.HTTPError, ValueError):
+            # If fetching or parsing fails, skip this include
+            return None
 
     def read_tasks(self) -> list[Task]:
+        """Read the tasks of this taskfile and its includes.
+
+        Variables are not resolved, so no ``sh:`` command runs, unless
+        ``resolve_vars`` is set; :meth:`resolve_task_vars` resolves them for
+        the tasks that are actually used instead.
+        """
         base_taskfile = self._read()
         tasks = base_taskfile.tasks
+        base_dir = self.path.parent if self.path is not None else Path.cwd()
+        # Variable scopes from lowest to highest precedence, as go-task applies them
+        base_scope = VarScope(base_taskfile.vars, base_dir)
+        scoped_tasks = [ScopedTask(t, [base_scope], base_dir) for t in tasks]
+
+        def add_included(i: Include, template: Taskfile, included_dir: Path, trusted: bool = True) -> None:
+            included = template.instantiate(i.prefix)
+            tasks.extend(included.tasks)
+            # `dir` moves where the included tasks, and so their dynamic variables, run
+            task_dir = base_dir / i.dir if i.dir else included_dir
+            scopes = [base_scope, VarScope(i.vars, base_dir), VarScope(included.vars, task_dir, trusted)]
+            scoped_tasks.extend(ScopedTask(t, scopes, task_dir, trusted) for t in included.tasks)
+
+        # Each distinct file is parsed once without a prefix; every include instantiates it
+        templates: dict[str, Taskfile | None] = {}
+
         for i in base_taskfile.includes:
-            if i.taskfile.startswith("https://"):
-                # Fetch remote taskfile via HTTP GET
-                try:
-                    response = httpx.get(i.taskfile)
-                    response.raise_for_status()
-                    content = response.text
-                    remote_taskfile = TaskFileRepository._read_from_content(content, prefix=i.prefix)
-                    tasks.extend(remote_taskfile.tasks)
-                except (httpx.HTTPError, ValueError):
-                    # If fetching or parsing fails, skip this include
-                    pass
+            if is_remote(i.taskfile):
+                if i.taskfile not in templates:
+                    templates[i.taskfile] = self._read_remote_template(i.taskfile)
+                template = templates[i.taskfile]
+                if template is not None:
+                    # Remote taskfiles are not trusted to run `sh:` commands on this machine
+                    add_included(i, template, base_dir, trusted=False)
             else:
                 relative_path = Path(i.taskfile)
                 if self.path is None:
                     raise ValueError("Base taskfile path required for resolving relative includes")
                 target_path = self.path.parent / relative_path
-                tasks.extend(TaskFileRepository(path=str(target_path), prefix=i.prefix)._read().tasks)
+                key = str(target_path.resolve())
+                template = templates.get(key)
+                if template is None:
+                    template = TaskFileRepository(
+                        path=str(target_path), local_limits=self.local_limits, cache=self.cache
+                    )._read()
+                    templates[key] = template
+                add_included(i, template, target_path.parent)
 
+        self._scoped_tasks = scoped_tasks
+        if self.resolve_vars:
+            resolve_vars(scoped_tasks, self.evaluator)
         return tasks
 
+    def resolve_task_vars(self, tasks: list[Task]) -> None:
+        """Resolve the required variables of ``tasks`` from the last :meth:`read_tasks` call only.
+
+        Dynamic variables that no task in ``tasks`` requires are not run.
+        """
+        wanted = {id(t) for t in tasks}
+        resolve_vars([s for s in self._scoped_tasks if id(s.task) in wanted], self.evaluator)
+
 
 class TaskfileFinder:
     def __init__(self, root_dir: str):
@@ -77,13 +227,7 @@ class TaskfileFinder:
 
     def find(self) -> str | None:
         # Check for all possible taskfile name variations
-        candidates = [
-            "taskfile.yaml",
-            "taskfile.yml",
-            "Taskfile.yaml",
-            "Taskfile.yml",
-        ]
-        for candidate in candidates:
+        for candidate in TASKFILE_CANDIDATES:
             taskfile_path = self.root_dir / candidate
             if taskfile_path.exists():
                 return str(taskfile_path)
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from taskfile_parser.domain.timing import TimingRecord
+from taskfile_parser.repository.filelock import FileLock
+
+DEFAULT_TIMINGS_PATH = ".taskfile-timings.jsonl"
+
+# Number of most recent runs averaged into an estimate
+DEFAULT_WINDOW = 5
+
+
+class TimingRepository:
+    """Append-only JSON Lines history of task durations."""
+
+    def __init__(self, path: str = DEFAULT_TIMINGS_PATH):
+        self.path = Path(path)
+
+    def append(self, record: TimingRecord) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel `record` runs append to the same history; keep their lines whole
+        with FileLock(self.path.with_name(f".{self.path.name}.lock")), open(self.path, "a", encoding="utf-8") as f:
+            f.write(record.model_dump_json() + "\n")
+
+    def read(self) -> list[TimingRecord]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(TimingRecord.model_validate_json(line))
+                except ValidationError:
+                    # Skip lines truncated by an interrupted writer
+                    continue
+        return records
+
+    def estimates(self, window: int = DEFAULT_WINDOW) -> dict[str, float]:
+        """Return the mean duration of the last ``window`` runs of each task."""
+        history: dict[str, list[float]] = {}
+        for r in sorted(self.read(), key=lambda r: r.recorded_at):
+            history.setdefault(r.task, []).append(r.duration)
+        return {task: sum(d[-window:]) / len(d[-window:]) for task, d in history.items()}
@@ -0,0 +1,158 @@
+import subprocess
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from taskfile_parser.domain.taskfile import Task
+
+DEFAULT_SH_TTL = 60.0
+DEFAULT_SH_TIMEOUT = 30.0
+DEFAULT_SH_WORKERS = 8
+
+
+class VarScope(NamedTuple):
+    vars: dict
+    # Directory the dynamic variables of this scope run in
+    dir: Path
+    # Whether dynamic variables of this scope may run; false for remote taskfiles
+    trusted: bool = True
+
+
+class ScopedTask(NamedTuple):
+    task: Task
+    # Scopes enclosing the task, from lowest to highest precedence
+    scopes: list[VarScope]
+    # Directory the task runs in, and so its own dynamic variables
+    dir: Path
+    # Whether the task's own dynamic variables may run
+    trusted: bool = True
+
+
+class ShellVarEvaluator:
+    """Evaluate dynamic ``sh:`` variables concurrently.
+
+    Results are cached per ``(command, cwd)`` for ``ttl`` seconds, so a
+    command shared by many tasks or includes runs once per listing.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_SH_WORKERS,
+        ttl: float = DEFAULT_SH_TTL,
+        timeout: float = DEFAULT_SH_TIMEOUT,
+    ):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.timeout = timeout
+        self._cache: dict[tuple[str, str], tuple[float, str | None]] = {}
+        self._lock = threading.Lock()
+
+    def _run(self, command: str, cwd: str) -> str | None:
+        try:
+            completed = subprocess.run(
+                command,
+                shell=True,
+                cwd=cwd,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if completed.returncode != 0:
+            return None
+        return completed.stdout.rstrip("\r\n")
+
+    def evaluate(self, commands: Iterable[tuple[str, str]]) -> dict[tuple[str, str], str | None]:
+        """Return the output of every ``(command, cwd)``; failed commands map to ``None``."""
+        now = time.monotonic()
+        results: dict[tuple[str, str], str | None] = {}
+        pending = []
+        with self._lock:
+            for key in dict.fromkeys(commands):
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] > now:
+                    results[key] = cached[1]
+                else:
+                    pending.append(key)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                outputs = list(executor.map(lambda key: self._run(*key), pending))
+            expires = time.monotonic() + self.ttl
+            with self._lock:
+                for key, output in zip(pending, outputs, strict=True):
+                    self._cache[key] = (expires, output)
+                    results[key] = output
+        return results
+
+
+_default_evaluator = ShellVarEvaluator()
+
+
+def default_evaluator() -> ShellVarEvaluator:
+    return _default_evaluator
+
+
+def _required_names(task: Task) -> list[str]:
+    names = []
+    for v in (task.requires or {}).get("vars") or []:
+        name = v.get("name", "") if isinstance(v, dict) else str(v)
+        if name:
+            names.append(name)
+    return names
+
+
+def _lookup(scopes: list[VarScope], name: str) -> tuple[object, VarScope] | None:
+    """Return the highest-precedence definition of ``name``; ``scopes`` go from lowest to highest."""
+    for scope in reversed(scopes):
+        if name in scope.vars:
+            return scope.vars[name], scope
+    return None
+
+
+def _is_template(value: object) -> bool:
+    return isinstance(value, str) and "{{" in value
+
+
+def resolve_vars(scoped_tasks: list[ScopedTask], evaluator: ShellVarEvaluator | None = None) -> None:
+    """Fill ``Task.resolved_vars`` for the variables each task requires.
+
+    A task's own ``vars`` are only loaded when it requires variables. Only
+    the definition that wins go-task's precedence is evaluated, and dynamic
+    ``sh:`` values of all ``scoped_tasks`` are run in one batch.
+
+    Environment variables are not consulted. Values that are neither scalars
+    nor ``sh:`` (e.g. ``ref:``, ``map:``), values using go-task templates and
+    ``sh:`` values from untrusted scopes are left unresolved.
+    """
+    winners: list[tuple[Task, str, object, VarScope]] = []
+    for task, scopes, task_dir, trusted in scoped_tasks:
+        names = _required_names(task)
+        if not names:
+            continue
+        task_scopes = [*scopes, VarScope(task.vars, task_dir, trusted)]
+        for name in names:
+            found = _lookup(task_scopes, name)
+            if found is not None:
+                winners.append((task, name, *found))
+
+    commands = []
+    for task, name, value, scope in winners:
+        if isinstance(value, dict) and "sh" in value and scope.trusted and not _is_template(value["sh"]):
+            commands.append((str(value["sh"]), str(scope.dir)))
+    outputs = (evaluator or default_evaluator()).evaluate(commands) if commands else {}
+
+    for task, name, value, scope in winners:
+        if isinstance(value, dict):
+            output = outputs.get((str(value["sh"]), str(scope.dir))) if "sh" in value else None
+            if output is None:
+                continue
+            task.resolved_vars[name] = output
+        elif isinstance(value, bool):
+            task.resolved_vars[name] = str(value).lower()
+        elif value is not None and not _is_template(value):
+            task.resolved_vars[name] = str(value)
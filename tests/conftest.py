@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+
+class RemoteRoutes(dict):
+    """URL -> response body (or exception to raise) served in place of the network."""
+
+    def __init__(self):
+        super().__init__()
+        self.requested: list[str] = []
+        self.headers: dict[str, dict[str, str]] = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.requested.append(url)
+        body = self.get(url)
+        if body is None:
+            return httpx.Response(404)
+        if isinstance(body, Exception):
+            raise body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        validators = self.headers.get(url, {})
+        etag = validators.get("ETag")
+        if etag is not None and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        headers = {"Content-Length": str(len(body)), **validators}
+        # Pass a stream rather than content so the client reads the body incrementally
+        return httpx.Response(200, stream=httpx.ByteStream(body), headers=headers)
+
+
+@pytest.fixture
+def remote_routes():
+    """Serve remote includes from memory by patching ``httpx.stream``."""
+    routes = RemoteRoutes()
+    client = httpx.Client(transport=httpx.MockTransport(routes.handler))
+    with patch("taskfile_parser.repository.remote.httpx.stream", client.stream):
+        yield routes
+    client.close()
@@ -0,0 +1,72 @@
+from taskfile_parser.domain.matcher import TaskMatcher
+from taskfile_parser.domain.taskfile import Task
+
+
+def _task(name, prefix=None, aliases=None):
+    return Task(desc="", prefix=prefix, name=name, requires={}, aliases=aliases or [])
+
+
+class TestTaskMatcher:
+    """Test cases for the TaskMatcher class."""
+
+    def test_match_exact_name(self):
+        """Test matching a task by its full command."""
+        build = _task("build", prefix="backend")
+        match = TaskMatcher([_task("build"), build]).match("backend:build")
+        assert match.task is build
+        assert match.command == "backend:build"
+        assert match.captures == []
+
+    def test_match_alias(self):
+        """Test matching a task by an alias, prefixed for included tasks."""
+        deploy = _task("deploy", prefix="infra", aliases=["d", "ship"])
+        matcher = TaskMatcher([deploy])
+        assert matcher.match("infra:d").task is deploy
+        assert matcher.match("infra:ship").command == "infra:deploy"
+        assert matcher.match("d") is None
+
+    def test_match_wildcard_returns_captures(self):
+        """Test matching a wildcard task and returning captured segments."""
+        deploy = _task("deploy:*:*")
+        match = TaskMatcher([deploy]).match("deploy:prod:ap-northeast-1")
+        assert match.task is deploy
+        assert match.command == "deploy:prod:ap-northeast-1"
+        assert match.captures == ["prod", "ap-northeast-1"]
+        assert match.task.gen_buffer(match.command) == "task deploy:prod:ap-northeast-1"
+
+    def test_match_prefers_exact_over_wildcard(self):
+        """Test that an exact name wins over a wildcard pattern."""
+        exact = _task("deploy:local")
+        matcher = TaskMatcher([_task("deploy:*"), exact])
+        assert matcher.match("deploy:local").task is exact
+
+    def test_match_wildcards_in_definition_order(self):
+        """Test that the first matching wildcard pattern wins."""
+        first = _task("start:*")
+        second = _task("*:server")
+        third = _task("stop:*")
+        matcher = TaskMatcher([first, second, third])
+        assert matcher.match("start:server").task is first
+        assert matcher.match("run:server").task is second
+        assert matcher.match("stop:db").task is third
+        assert matcher.match("stop:db").captures == ["db"]
+
+    def test_plain_alias_of_wildcard_task_is_skipped(self):
+        """Test that an alias without a wildcard cannot select a wildcard task."""
+        deploy = _task("deploy:*", aliases=["d", "d:*"])
+        matcher = TaskMatcher([deploy])
+        assert matcher.match("d") is None
+        match = matcher.match("d:prod")
+        assert match.task is deploy
+        assert match.task.gen_buffer(match.command) == "task d:prod"
+
+    def test_match_wildcard_escapes_name(self):
+        """Test that regex metacharacters in task names are literal."""
+        matcher = TaskMatcher([_task("gen.*")])
+        assert matcher.match("gen.docs").captures == ["docs"]
+        assert matcher.match("genXdocs") is None
+
+    def test_no_match(self):
+        """Test that unknown names return None."""
+        assert TaskMatcher([]).match("build") is None
+        assert TaskMatcher([_task("build")]).match("test") is None
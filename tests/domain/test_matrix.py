@@ -0,0 +1,70 @@
+import pytest
+
+from taskfile_parser.domain.matrix import partition
+from taskfile_parser.domain.taskfile import Task
+
+
+def _task(name, deps=None, prefix=None):
+    return Task(desc="", prefix=prefix, name=name, requires={}, deps=deps or [])
+
+
+class TestPartition:
+    """Test cases for the partition function."""
+
+    def test_balances_by_estimate(self):
+        """Test the longest-processing-time assignment."""
+        tasks = [_task(n) for n in ["a", "b", "c", "d", "e"]]
+        estimates = {"a": 7, "b": 5, "c": 4, "d": 3, "e": 1}
+        matrix = partition(tasks, estimates, shards=2)
+
+        assert [s.tasks for s in matrix.include] == [["a", "d"], ["b", "c", "e"]]
+        assert [s.estimated_seconds for s in matrix.include] == [10, 10]
+
+    def test_default_estimate_for_unknown_tasks(self):
+        """Test that tasks without history use the default estimate."""
+        tasks = [_task(n) for n in ["a", "b", "c"]]
+        matrix = partition(tasks, {"a": 10}, shards=2, default=2)
+        assert [s.tasks for s in matrix.include] == [["a"], ["b", "c"]]
+
+    def test_dependencies_share_a_shard_in_order(self):
+        """Test that dependent tasks stay together and run after their deps."""
+        tasks = [
+            _task("test", deps=["build"], prefix="backend"),
+            _task("build", prefix="backend"),
+            _task("e2e", deps=[":backend:test", {"task": ":lint"}]),
+            _task("lint"),
+            _task("docs"),
+        ]
+        estimates = {"backend:test": 5, "backend:build": 5, "e2e": 5, "lint": 1, "docs": 10}
+        matrix = partition(tasks, estimates, shards=2)
+
+        assert [s.tasks for s in matrix.include] == [["backend:build", "lint", "backend:test", "e2e"], ["docs"]]
+
+    def test_shared_dependency_does_not_merge_shards(self):
+        """Test that tasks sharing a dep spread over shards, each shard paying for the dep once."""
+        tasks = [_task("setup")] + [_task(f"t{n}", deps=["setup"]) for n in range(8)]
+        estimates = {"setup": 1, **{f"t{n}": 60 for n in range(8)}}
+        matrix = partition(tasks, estimates, shards=4)
+
+        assert [s.tasks for s in matrix.include] == [
+            ["setup", "t0", "t4"],
+            ["t1", "t5"],
+            ["t2", "t6"],
+            ["t3", "t7"],
+        ]
+        assert [s.estimated_seconds for s in matrix.include] == [121, 121, 121, 121]
+
+    def test_drops_empty_shards(self):
+        """Test that more shards than tasks only yields non-empty shards."""
+        matrix = partition([_task("a")], {}, shards=4)
+        assert [(s.shard, s.tasks) for s in matrix.include] == [(0, ["a"])]
+
+    def test_dependency_cycle(self):
+        """Test that a dependency cycle keeps catalog order instead of hanging."""
+        tasks = [_task("a", deps=["b"]), _task("b", deps=["a"])]
+        assert partition(tasks, {}, shards=2).include[0].tasks == ["a", "b"]
+
+    def test_invalid_shards(self):
+        """Test that zero shards is rejected."""
+        with pytest.raises(ValueError):
+            partition([], {}, shards=0)
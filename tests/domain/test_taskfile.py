@@ -1,4 +1,14 @@
-from taskfile_parser.domain.taskfile import Include, Task, Taskfile
+from taskfile_parser.domain.taskfile import Include, LazyValue, Task, Taskfile
+
+
+class CountingValue(LazyValue):
+    def __init__(self, value):
+        self.value = value
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.value
 
 
 class TestInclude:
@@ -198,6 +208,52 @@ class TestTask:
         assert "VAR1=" in buffer
         assert "task test-task" in buffer
 
+    def test_gen_buffer_with_resolved_vars(self):
+        """Test generating buffer pre-filled with resolved values (shell-quoted)."""
+        task = Task(
+            desc="Deploy task",
+            prefix=None,
+            name="deploy",
+            requires={"vars": ["VAR1", {"name": "ENV", "enum": ["dev", "prod"]}, "VAR2"]},
+            resolved_vars={"VAR1": "a b", "ENV": "prod"},
+        )
+        assert task.gen_buffer() == "VAR1='a b' ENV=prod VAR2= task deploy"
+
+    def test_gen_deps(self):
+        """Test resolving deps relative to the task prefix."""
+        task = Task(
+            desc="Test task",
+            prefix="backend",
+            name="test",
+            requires={},
+            deps=["build", {"task": "lint"}, ":generate", {"vars": {}}],
+        )
+        assert task.gen_deps() == ["backend:build", "backend:lint", "generate"]
+
+    def test_lazy_fields_load_once_on_access(self):
+        """Test that lazy fields are loaded on first access only."""
+        cmds = CountingValue(["echo hi"])
+        task = Task(desc="Test task", prefix=None, name="test", requires={}, cmds=cmds, vars=CountingValue(None))
+        assert cmds.loads == 0
+        assert task.gen_command() == "test"
+        assert cmds.loads == 0
+
+        assert task.cmds == ["echo hi"]
+        assert task.cmds == ["echo hi"]
+        assert cmds.loads == 1
+        # Missing or empty values fall back to an empty value of the field type
+        assert task.vars == {}
+        assert task.deps == []
+        assert task.summary == ""
+
+    def test_lazy_fields_compare_and_dump_loaded(self):
+        """Test that equality and dumps use loaded values."""
+        lazy = Task(desc="Test task", prefix=None, name="test", requires={}, deps=CountingValue(["build"]))
+        eager = Task(desc="Test task", prefix=None, name="test", requires={}, deps=["build"])
+        assert lazy == eager
+        assert Task.model_validate(lazy.model_dump()) == eager
+        assert lazy.model_dump()["deps"] == ["build"]
+
 
 class TestTaskfile:
     """Test cases for the Taskfile model."""
@@ -237,3 +293,21 @@ class TestTaskfile:
         taskfile = Taskfile(includes=includes, tasks=tasks)
         assert len(taskfile.includes) == 1
         assert len(taskfile.tasks) == 1
+
+    def test_instantiate_shares_unchanged_fields(self):
+        """Test that instances get their own prefix and share everything else."""
+        cmds = CountingValue(["deploy"])
+        template = Taskfile(
+            includes=[],
+            tasks=[Task(desc="Deploy", prefix=None, name="deploy", requires={"vars": ["REGION"]}, cmds=cmds)],
+        )
+        us, eu = template.instantiate("us"), template.instantiate("eu")
+
+        assert [t.gen_command() for t in us.tasks + eu.tasks] == ["us:deploy", "eu:deploy"]
+        assert template.tasks[0].prefix is None
+        assert us.tasks[0].requires is eu.tasks[0].requires
+        assert us.tasks[0].cmds == eu.tasks[0].cmds == ["deploy"]
+        assert cmds.loads == 1
+
+        us.tasks[0].resolved_vars["REGION"] = "us-east-1"
+        assert eu.tasks[0].resolved_vars == {}
@@ -0,0 +1,324 @@
+import io
+import subprocess
+import sys
+
+import pytest
+
+from taskfile_parser.exceptions import YamlLimitError
+from taskfile_parser.lsp.document import TextDocument
+from taskfile_parser.lsp.index import TaskfileIndex
+from taskfile_parser.lsp.server import TaskfileLanguageServer, read_message, write_message
+
+MAIN_CONTENT = """includes:
+  backend: ./backend/Taskfile.yml
+tasks:
+  build:
+    desc: Build the application
+    deps:
+      - lint
+      - backend:compile
+  lint:
+    desc: Lint the sources
+  deploy:
+    desc: Deploy
+    requires:
+      vars:
+        - ENV
+    cmds:
+      - task: build
+"""
+
+BACKEND_CONTENT = """tasks:
+  compile:
+    desc: Compile backend
+"""
+
+
+def _position(line, character):
+    return {"line": line, "character": character}
+
+
+def _open(server, uri, text):
+    server.handle(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": uri, "languageId": "yaml", "version": 1, "text": text}},
+        }
+    )
+
+
+def _request(server, method, uri, line, character):
+    response = server.handle(
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": method,
+            "params": {"textDocument": {"uri": uri}, "position": _position(line, character)},
+        }
+    )
+    return response["result"]
+
+
+def _workspace(tmp_path):
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "Taskfile.yml").write_text(BACKEND_CONTENT)
+    main = tmp_path / "Taskfile.yml"
+    main.write_text(MAIN_CONTENT)
+    return main
+
+
+class TestTextDocument:
+    """Test cases for the TextDocument class."""
+
+    def test_apply_incremental_change(self):
+        """Test replacing a range inside one line."""
+        document = TextDocument("file:///Taskfile.yml", "tasks:\n  build:\n    desc: x\n")
+        document.apply_change(
+            {"range": {"start": _position(1, 2), "end": _position(1, 7)}, "text": "compile"},
+        )
+        assert document.text == "tasks:\n  compile:\n    desc: x\n"
+
+    def test_apply_multiline_change(self):
+        """Test replacing a range that spans several lines."""
+        document = TextDocument("file:///Taskfile.yml", "a\nb\nc\n")
+        document.apply_change({"range": {"start": _position(0, 1), "end": _position(2, 0)}, "text": "-"})
+        assert document.text == "a-c\n"
+
+    def test_apply_full_change(self):
+        """Test a change event without range replaces the whole text."""
+        document = TextDocument("file:///Taskfile.yml", "a\n")
+        document.apply_change({"text": "b\n"})
+        assert document.text == "b\n"
+        assert document.line(0) == "b"
+
+
+class TestTaskfileIndex:
+    """Test cases for the TaskfileIndex class."""
+
+    def test_build_indexes_tasks_includes_and_references(self):
+        """Test spans for task names, include prefixes and references."""
+        index = TaskfileIndex.build(MAIN_CONTENT)
+
+        assert list(index.tasks) == ["build", "lint", "deploy"]
+        assert index.tasks["build"].start_line == 3
+        assert index.includes["backend"].taskfile == "./backend/Taskfile.yml"
+        assert index.symbol_at(3, 3).name == "build"
+        assert index.symbol_at(6, 9).kind == "reference"
+        assert index.symbol_at(7, 12).name == "backend:compile"
+        assert index.symbol_at(16, 15).name == "build"
+        assert index.symbol_at(0, 0) is None
+
+    def test_build_large_taskfile(self):
+        """Test indexing a Taskfile with roughly ten thousand lines."""
+        lines = ["tasks:"]
+        for i in range(2500):
+            lines += [f"  task-{i}:", f"    desc: Task {i}", "    deps:", f"      - task-{max(i - 1, 0)}"]
+        index = TaskfileIndex.build("\n".join(lines) + "\n")
+
+        assert len(index.tasks) == 2500
+        assert index.symbol_at(9996, 9).name == "task-2497"
+        assert index.task("task-2499").desc == "Task 2499"
+
+    def test_build_enforces_limits(self):
+        """Test that an alias bomb is rejected while composing."""
+        lines = ["a0: &a0 [x, x, x, x, x, x, x, x, x, x]"]
+        lines += [f"a{i}: &a{i} [*a{i - 1}, *a{i - 1}, *a{i - 1}, *a{i - 1}, *a{i - 1}]" for i in range(1, 10)]
+        with pytest.raises(YamlLimitError):
+            TaskfileIndex.build("\n".join(lines) + "\n")
+
+
+class TestTaskfileLanguageServer:
+    """Test cases for the TaskfileLanguageServer class."""
+
+    def test_definition_local_and_included(self, tmp_path):
+        """Test go-to-definition for local and prefixed task references."""
+        main = _workspace(tmp_path)
+        server = TaskfileLanguageServer()
+        _open(server, main.as_uri(), MAIN_CONTENT)
+
+        local = _request(server, "textDocument/definition", main.as_uri(), 6, 9)
+        assert local["uri"] == main.as_uri()
+        assert local["range"]["start"] == _position(8, 2)
+
+        included = _request(server, "textDocument/definition", main.as_uri(), 7, 12)
+        assert included["uri"] == (tmp_path / "backend" / "Taskfile.yml").as_uri()
+        assert included["range"]["start"] == _position(1, 2)
+
+        include = _request(server, "textDocument/definition", main.as_uri(), 1, 3)
+        assert include["uri"] == (tmp_path / "backend" / "Taskfile.yml").as_uri()
+
+    def test_hover(self, tmp_path):
+        """Test hover shows description, required vars and buffer."""
+        main = _workspace(tmp_path)
+        server = TaskfileLanguageServer()
+        _open(server, main.as_uri(), MAIN_CONTENT)
+
+        hover = _request(server, "textDocument/hover", main.as_uri(), 10, 3)
+        value = hover["contents"]["value"]
+        assert "**deploy**" in value
+        assert "Deploy" in value
+        assert "`ENV`" in value
+        assert "ENV= task deploy" in value
+
+        hover = _request(server, "textDocument/hover", main.as_uri(), 7, 12)
+        assert "task backend:compile" in hover["contents"]["value"]
+
+    def test_completion(self, tmp_path):
+        """Test completion lists local and included task names."""
+        main = _workspace(tmp_path)
+        server = TaskfileLanguageServer()
+        _open(server, main.as_uri(), MAIN_CONTENT)
+
+        items = _request(server, "textDocument/completion", main.as_uri(), 0, 0)
+        assert [i["label"] for i in items] == ["build", "lint", "deploy", "backend:compile"]
+
+    def test_incremental_change_reindexes(self, tmp_path):
+        """Test that an incremental edit is reflected in the index."""
+        main = _workspace(tmp_path)
+        server = TaskfileLanguageServer()
+        _open(server, main.as_uri(), MAIN_CONTENT)
+        server.handle(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": main.as_uri(), "version": 2},
+                    "contentChanges": [
+                        {"range": {"start": _position(8, 2), "end": _position(8, 6)}, "text": "check"},
+                    ],
+                },
+            }
+        )
+
+        items = _request(server, "textDocument/completion", main.as_uri(), 0, 0)
+        assert "check" in [i["label"] for i in items]
+        assert "lint" not in [i["label"] for i in items]
+
+    def test_changes_reindex_once_per_request(self, tmp_path, monkeypatch):
+        """Test that a burst of edits is re-indexed once, when the next request needs it."""
+        main = _workspace(tmp_path)
+        server = TaskfileLanguageServer()
+        _open(server, main.as_uri(), MAIN_CONTENT)
+        built = []
+        build = TaskfileIndex.build
+        monkeypatch.setattr(TaskfileIndex, "build", lambda text: built.append(text) or build(text))
+        for i in range(5):
+            server.handle(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "textDocument/didChange",
+                    "params": {
+                        "textDocument": {"uri": main.as_uri(), "version": i + 2},
+                        "contentChanges": [{"text": MAIN_CONTENT.replace("  lint:", f"  lint{i}:")}],
+                    },
+                }
+            )
+        assert built == []
+
+        items = _request(server, "textDocument/completion", main.as_uri(), 0, 0)
+        assert "lint4" in [i["label"] for i in items]
+        _request(server, "textDocument/hover", main.as_uri(), 10, 3)
+        # The other build indexes the included file from disk
+        assert built.count(MAIN_CONTENT.replace("  lint:", "  lint4:")) == 1
+
+    def test_invalid_yaml_keeps_last_index(self, tmp_path):
+        """Test that a broken edit keeps serving the previous index."""
+        main = _workspace(tmp_path)
+        server = TaskfileLanguageServer()
+        _open(server, main.as_uri(), MAIN_CONTENT)
+        server.handle(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": main.as_uri(), "version": 2},
+                    "contentChanges": [{"text": "a: [\n"}],
+                },
+            }
+        )
+
+        items = _request(server, "textDocument/completion", main.as_uri(), 0, 0)
+        assert "build" in [i["label"] for i in items]
+
+    def test_unknown_method(self):
+        """Test that unknown requests return a method-not-found error."""
+        response = TaskfileLanguageServer().handle({"jsonrpc": "2.0", "id": 7, "method": "foo/bar"})
+        assert response["error"]["code"] == -32601
+
+    def test_bad_messages_do_not_stop_server(self, tmp_path):
+        """Test that failed requests get an internal error and the server keeps answering."""
+        main = _workspace(tmp_path)
+        stdin = io.BytesIO()
+        for message in [
+            # didOpen without text, and a hover without a position
+            {"jsonrpc": "2.0", "method": "textDocument/didOpen", "params": {"textDocument": {"uri": main.as_uri()}}},
+            {"jsonrpc": "2.0", "id": 1, "method": "textDocument/hover", "params": {"textDocument": {}}},
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didOpen",
+                "params": {"textDocument": {"uri": main.as_uri(), "version": 1, "text": MAIN_CONTENT}},
+            },
+            {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "textDocument/definition",
+                "params": {"textDocument": {"uri": main.as_uri()}, "position": _position(16, 15)},
+            },
+        ]:
+            write_message(stdin, message)
+        stdin.write(b"Content-Length: 5\r\n\r\n{oops")
+        write_message(stdin, {"jsonrpc": "2.0", "id": 3, "method": "shutdown"})
+        stdin.seek(0)
+        stdout = io.BytesIO()
+
+        TaskfileLanguageServer().serve(stdin, stdout)
+
+        stdout.seek(0)
+        responses = []
+        while (message := read_message(stdout)) is not None:
+            responses.append(message)
+        assert [r["id"] for r in responses] == [1, 2, None, 3]
+        assert responses[0]["error"]["code"] == -32603
+        assert responses[1]["result"]["range"]["start"] == _position(3, 2)
+        assert responses[2]["error"]["code"] == -32700
+
+    def test_serve_over_stdio(self, tmp_path):
+        """Test a full session against the `parser lsp` subprocess."""
+        main = _workspace(tmp_path)
+        stdin = io.BytesIO()
+        for message in [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "method": "initialized", "params": {}},
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didOpen",
+                "params": {"textDocument": {"uri": main.as_uri(), "version": 1, "text": MAIN_CONTENT}},
+            },
+            {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "textDocument/definition",
+                "params": {"textDocument": {"uri": main.as_uri()}, "position": _position(16, 15)},
+            },
+            {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ]:
+            write_message(stdin, message)
+
+        completed = subprocess.run(
+            [sys.executable, "-m", "taskfile_parser.cli", "lsp"],
+            input=stdin.getvalue(),
+            capture_output=True,
+            timeout=30,
+            check=True,
+        )
+        stdout = io.BytesIO(completed.stdout)
+        responses = []
+        while (message := read_message(stdout)) is not None:
+            responses.append(message)
+
+        assert [r["id"] for r in responses] == [1, 2, 3]
+        assert responses[0]["result"]["capabilities"]["hoverProvider"] is True
+        assert responses[1]["result"]["range"]["start"] == _position(3, 2)
+        assert responses[2]["result"] is None
@@ -0,0 +1,325 @@
+import gzip
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from taskfile_parser.domain.taskfile import LAZY_FIELDS
+from taskfile_parser.exceptions import LockTimeoutError, RemoteFetchError
+from taskfile_parser.repository.cache import CACHE_DIR_ENV, TaskfileCache
+from taskfile_parser.repository.filelock import FileLock, atomic_write
+from taskfile_parser.repository.loader import DEFAULT_LOCAL_LIMITS, DeferredValue, load_document, load_yaml
+from taskfile_parser.repository.repository import TaskFileRepository
+
+REMOTE_URL = "https://example.com/Taskfile.yml"
+REMOTE_CONTENT = """
+tasks:
+  remote-build:
+    desc: Build remotely
+"""
+
+# Number of concurrent processes launched by the stress tests
+PROCESSES = 8
+
+STRESS_PARSE = """
+import sys, time
+from taskfile_parser.repository.cache import TaskfileCache
+from taskfile_parser.repository.loader import DEFAULT_LOCAL_LIMITS, DeferredValue, load_document, load_yaml
+
+root, marker = sys.argv[1:]
+
+def load():
+    with open(marker, "a") as f:
+        f.write("parsed\\n")
+    time.sleep(0.3)
+    return {"vars": {"RESULT": "shared"}}
+
+document = TaskfileCache(root).document("0" * 64, DEFAULT_LOCAL_LIMITS, load, bytes)
+print(document["vars"]["RESULT"])
+"""
+
+STRESS_FETCH = """
+import sys
+from taskfile_parser.repository.cache import TaskfileCache
+
+root, url = sys.argv[1:]
+sys.stdout.write(TaskfileCache(root).fetch(url).read_text())
+"""
+
+
+def _run_concurrently(args: list[list[str]], env: dict[str, str] | None = None) -> list[str]:
+    """Start every command at once and return their outputs."""
+    processes = [subprocess.Popen(a, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env) for a in args]
+    outputs = []
+    for p in processes:
+        stdout, stderr = p.communicate(timeout=60)
+        assert p.returncode == 0, stderr
+        outputs.append(stdout)
+    return outputs
+
+
+def _leftover_temp_files(root) -> list:
+    return list(root.rglob("*.tmp"))
+
+
+class TestFileLock:
+    """Test cases for the FileLock class and atomic writes."""
+
+    def test_lock_is_exclusive(self, tmp_path):
+        """Test that a held lock makes another holder time out."""
+        path = tmp_path / "entry.lock"
+        with FileLock(path):
+            with pytest.raises(LockTimeoutError):
+                FileLock(path, timeout=0.1).acquire()
+        with FileLock(path, timeout=0.1):
+            pass
+
+    def test_waiter_follows_deleted_lock_file(self, tmp_path):
+        """Test that a process waiting on a lock file deleted by its holder locks the new file."""
+        path = tmp_path / "entry.lock"
+        waiter = FileLock(path, timeout=5)
+        with FileLock(path):
+            thread = threading.Thread(target=waiter.acquire)
+            thread.start()
+            time.sleep(0.1)
+            path.unlink()
+        thread.join()
+        # The waiter holds the file now at the path, so nobody else can lock it
+        with pytest.raises(LockTimeoutError):
+            FileLock(path, timeout=0.1).acquire()
+        waiter.release()
+
+    def test_atomic_write_replaces_file(self, tmp_path):
+        """Test that atomic writes replace the target and leave no temporary files."""
+        path = tmp_path / "dir" / "entry.json"
+        atomic_write(path, b"first")
+        atomic_write(path, b"second")
+        assert path.read_bytes() == b"second"
+        assert _leftover_temp_files(tmp_path) == []
+
+
+class TestTaskfileCache:
+    """Test cases for the TaskfileCache class."""
+
+    def test_fetch_reuses_body_within_ttl(self, tmp_path, remote_routes):
+        """Test that a fetched include is served from disk by later instances."""
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        assert TaskfileCache(tmp_path).fetch(REMOTE_URL).read_text() == REMOTE_CONTENT
+
+        cache = TaskfileCache(tmp_path)
+        assert cache.fetch(REMOTE_URL).read_text() == REMOTE_CONTENT
+        assert cache.fetch_count == 0
+        assert remote_routes.requested == [REMOTE_URL]
+
+    def test_fetch_revalidates_with_etag(self, tmp_path, remote_routes):
+        """Test that an expired entry is revalidated and kept on 304 Not Modified."""
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        remote_routes.headers[REMOTE_URL] = {"ETag": '"v1"'}
+        TaskfileCache(tmp_path).fetch(REMOTE_URL)
+
+        cache = TaskfileCache(tmp_path, remote_ttl=0)
+        assert cache.fetch(REMOTE_URL).read_text() == REMOTE_CONTENT
+        assert cache.fetch_count == 1
+        assert cache.cached_include(REMOTE_URL).etag == '"v1"'
+
+        remote_routes[REMOTE_URL] = "tasks: {}\n"
+        remote_routes.headers[REMOTE_URL] = {"ETag": '"v2"'}
+        assert cache.fetch(REMOTE_URL).read_bytes() == b"tasks: {}\n"
+        assert cache.cached_include(REMOTE_URL).etag == '"v2"'
+
+    def test_fetch_streams_to_disk_within_limit(self, tmp_path, remote_routes):
+        """Test that an oversized body is rejected and leaves nothing in the cache."""
+        # Compressed, so the limit is only hit while the body is being written
+        remote_routes[REMOTE_URL] = gzip.compress(b"#" * 4096)
+        remote_routes.headers[REMOTE_URL] = {"Content-Encoding": "gzip"}
+        with pytest.raises(RemoteFetchError):
+            TaskfileCache(tmp_path).fetch(REMOTE_URL, max_bytes=1024)
+        assert list(tmp_path.rglob("*.yml")) == []
+        assert _leftover_temp_files(tmp_path) == []
+
+    def test_document_loaded_once(self, tmp_path):
+        """Test that loaded documents are shared between cache instances."""
+        content = b"vars:\n  WHEN: 2024-01-01 10:00:00\n  1: one\ntasks:\n  a:\n    cmds: [echo a]\n"
+        calls = []
+
+        def load():
+            calls.append(1)
+            return load_yaml(io.BytesIO(content), DEFAULT_LOCAL_LIMITS, LAZY_FIELDS)
+
+        first = TaskfileCache(tmp_path).document("a" * 64, DEFAULT_LOCAL_LIMITS, load, lambda: content)
+        second = TaskfileCache(tmp_path).document("a" * 64, DEFAULT_LOCAL_LIMITS, load, lambda: content)
+        assert calls == [1]
+        # Values keep the types the YAML loader gave them
+        assert second["vars"] == {"WHEN": datetime(2024, 1, 1, 10, 0), 1: "one"}
+        assert isinstance(second["tasks"]["a"]["cmds"], DeferredValue)
+        assert second["tasks"]["a"]["cmds"].load() == first["tasks"]["a"]["cmds"].load() == ["echo a"]
+
+        TaskfileCache(tmp_path).document("b" * 64, DEFAULT_LOCAL_LIMITS, load, lambda: content)
+        assert calls == [1, 1]
+
+    def test_cli_output_same_cold_and_warm(self, tmp_path):
+        """Test that a cached parse prints exactly what a fresh parse printed."""
+        (tmp_path / "Taskfile.yml").write_text(
+            "vars:\n  WHEN: 2024-01-01 10:00:00\ntasks:\n  build:\n    requires:\n      vars: [WHEN]\n"
+        )
+        env = {**os.environ, CACHE_DIR_ENV: str(tmp_path / "cache")}
+        command = [sys.executable, "-m", "taskfile_parser.cli", "--pwd", str(tmp_path), "--taskfile-task-name", "build"]
+        cold = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        warm = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        assert cold == warm == "WHEN='2024-01-01 10:00:00' task build\n"
+
+    def test_prune_removes_unused_files(self, tmp_path, remote_routes):
+        """Test that pruning deletes files unused for max_age and keeps recently used ones."""
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        cache = TaskfileCache(tmp_path, max_age=3600)
+        blob = cache.fetch(REMOTE_URL)
+        stale = cache.root / "parsed" / "stale.yml"
+        atomic_write(stale, b"null\n")
+        atomic_write(stale.with_suffix(".lock"), b"")
+        past = time.time() - 7200
+        for path in (stale, stale.with_suffix(".lock"), blob):
+            os.utime(path, (past, past))
+
+        # Fetching marks the blob as used again
+        TaskfileCache(tmp_path).fetch(REMOTE_URL)
+        assert cache.prune() == 2
+        assert not stale.exists() and not stale.with_suffix(".lock").exists()
+        assert blob.exists()
+        assert cache.cached_include(REMOTE_URL) is not None
+
+    def test_prune_keeps_held_lock_files(self, tmp_path):
+        """Test that pruning skips a lock file while another process holds it."""
+        lock = tmp_path / "parsed" / "busy.lock"
+        atomic_write(lock, b"")
+        past = time.time() - 7200
+        os.utime(lock, (past, past))
+        cache = TaskfileCache(tmp_path, max_age=3600)
+        with FileLock(lock):
+            assert cache.prune() == 0
+        assert lock.exists()
+        assert cache.prune() == 1
+
+    def test_unusable_cache_dir_is_skipped(self, tmp_path, remote_routes):
+        """Test that read_tasks works uncached when the cache directory cannot be created."""
+        (tmp_path / "file").write_text("")
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(f"includes:\n  remote: {REMOTE_URL}\ntasks:\n  build: {{}}\n")
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+
+        cache = TaskfileCache(tmp_path / "file" / "cache")
+        tasks = TaskFileRepository(str(taskfile_path), cache=cache).read_tasks()
+        assert [t.gen_command() for t in tasks] == ["build", "remote:remote-build"]
+        assert cache.fetch(REMOTE_URL) is None
+
+    def test_prune_runs_at_most_daily(self, tmp_path):
+        """Test that caches prune on first use only when the last prune is a day old."""
+        stale = tmp_path / "parsed" / "stale.yml"
+        atomic_write(stale, b"null\n")
+        past = time.time() - 60 * 24 * 3600
+        os.utime(stale, (past, past))
+        atomic_write(tmp_path / "pruned", b"")
+
+        TaskfileCache(tmp_path).document("a" * 64, DEFAULT_LOCAL_LIMITS, lambda: None, bytes)
+        assert stale.exists()
+
+        os.utime(tmp_path / "pruned", (past, past))
+        TaskfileCache(tmp_path).document("a" * 64, DEFAULT_LOCAL_LIMITS, lambda: None, bytes)
+        assert not stale.exists()
+
+    def test_read_tasks_with_cache(self, tmp_path, remote_routes):
+        """Test that read_tasks reuses fetched includes and parse results."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "Taskfile.yml").write_text("tasks:\n  test:\n    desc: Test\n    deps: [build]\n")
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(f"includes:\n  remote: {REMOTE_URL}\n  sub: ./sub/Taskfile.yml\ntasks: {{}}\n")
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+
+        first = TaskFileRepository(str(taskfile_path), cache=TaskfileCache(tmp_path / "cache")).read_tasks()
+        cache = TaskfileCache(tmp_path / "cache")
+        second = TaskFileRepository(str(taskfile_path), cache=cache).read_tasks()
+
+        assert [t.gen_command() for t in second] == ["remote:remote-build", "sub:test"]
+        # Cached results keep deferring the heavy task fields
+        assert isinstance(second[1]._lazy["deps"], DeferredValue)
+        assert second == first
+        assert second[1].gen_deps() == ["sub:build"]
+        assert (cache.fetch_count, cache.parse_count) == (0, 0)
+        assert remote_routes.requested == [REMOTE_URL]
+
+    @pytest.mark.parametrize("flags", [["--no-cache", "matrix"], ["matrix", "--no-cache"]])
+    def test_no_cache_flag_for_matrix(self, tmp_path, flags):
+        """Test that --no-cache is honoured before and after the matrix subcommand."""
+        (tmp_path / "Taskfile.yml").write_text("tasks:\n  build: {}\n")
+        env = {**os.environ, CACHE_DIR_ENV: str(tmp_path / "cache")}
+        command = [sys.executable, "-m", "taskfile_parser.cli", *flags, "--pwd", str(tmp_path), "--shards", "1"]
+        subprocess.run(command, env=env, check=True, capture_output=True)
+        assert not (tmp_path / "cache").exists()
+
+
+class TestCacheConcurrency:
+    """Stress tests running many processes against one cache directory."""
+
+    def test_concurrent_parse_runs_once(self, tmp_path):
+        """Test that cold concurrent processes parse once and all reuse the result."""
+        marker = tmp_path / "parses.log"
+        args = [[sys.executable, "-c", STRESS_PARSE, str(tmp_path / "cache"), str(marker)]] * PROCESSES
+
+        outputs = _run_concurrently(args)
+
+        assert outputs == ["shared\n"] * PROCESSES
+        assert marker.read_text() == "parsed\n"
+        assert _leftover_temp_files(tmp_path) == []
+
+    def test_concurrent_fetch_runs_once(self, tmp_path):
+        """Test that cold concurrent processes send a single request for the same include."""
+        requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests.append(self.path)
+                time.sleep(0.3)
+                body = REMOTE_CONTENT.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/Taskfile.yml"
+            env = {k: v for k, v in os.environ.items() if "proxy" not in k.lower()}
+            args = [[sys.executable, "-c", STRESS_FETCH, str(tmp_path / "cache"), url]] * PROCESSES
+            outputs = _run_concurrently(args, env=env)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert outputs == [REMOTE_CONTENT] * PROCESSES
+        assert requests == ["/Taskfile.yml"]
+        assert _leftover_temp_files(tmp_path) == []
+
+    def test_concurrent_cli_invocations(self, tmp_path):
+        """Test that parallel `parser` runs agree and leave one parse result per file."""
+        (tmp_path / "Taskfile.yml").write_text("tasks:\n  build:\n    desc: Build\n    requires:\n      vars: [ENV]\n")
+        env = {**os.environ, CACHE_DIR_ENV: str(tmp_path / "cache")}
+        args = [
+            [sys.executable, "-m", "taskfile_parser.cli", "--pwd", str(tmp_path), "--taskfile-task-name", "build"]
+        ] * PROCESSES
+
+        outputs = _run_concurrently(args, env=env)
+
+        assert outputs == ["ENV= task build\n"] * PROCESSES
+        [parsed] = (tmp_path / "cache" / "parsed").glob("*.yml")
+        assert list(load_document(parsed.read_bytes(), bytes)["tasks"]) == ["build"]
+        assert _leftover_temp_files(tmp_path) == []
@@ -0,0 +1,137 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from taskfile_parser.repository.cache import CACHE_DIR_ENV, TaskfileCache
+from taskfile_parser.repository.fingerprint import TaskfileFingerprinter
+from taskfile_parser.repository.lockfile import RemoteBundle
+
+REMOTE_URL = "https://example.com/Taskfile.yml"
+
+
+def _age(*paths):
+    """Move mtimes out of the window in which digests are not cached."""
+    past = time.time() - 60
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "backend").mkdir()
+    backend = tmp_path / "backend" / "Taskfile.yml"
+    backend.write_text("includes:\n  db: ../db.yml\ntasks:\n  build:\n    desc: Build\n")
+    db = tmp_path / "db.yml"
+    db.write_text("tasks:\n  migrate:\n    desc: Migrate\n")
+    root = tmp_path / "Taskfile.yml"
+    root.write_text(f"includes:\n  backend: ./backend/Taskfile.yml\n  remote: {REMOTE_URL}\ntasks: {{}}\n")
+    _age(root, backend, db)
+    return root
+
+
+class TestTaskfileFingerprinter:
+    """Test cases for the TaskfileFingerprinter class."""
+
+    def test_unchanged_tree_needs_no_reads(self, tmp_path, workspace):
+        """Test that a second run reuses cached digests and yields the same hash."""
+        first = TaskfileFingerprinter(TaskfileCache(tmp_path / "cache"))
+        fingerprint = first.fingerprint(str(workspace))
+        assert first.read_count == 3
+        assert [n.source for n in fingerprint.nodes] == [
+            str(tmp_path / "db.yml"),
+            str(tmp_path / "backend" / "Taskfile.yml"),
+            REMOTE_URL,
+            str(workspace),
+        ]
+
+        second = TaskfileFingerprinter(TaskfileCache(tmp_path / "cache"))
+        assert second.fingerprint(str(workspace)) == fingerprint
+        assert second.read_count == 0
+
+    def test_change_in_nested_include_changes_root(self, tmp_path, workspace):
+        """Test that editing a nested include changes its ancestors' hashes only."""
+        before = TaskfileFingerprinter(TaskfileCache(tmp_path / "cache")).fingerprint(str(workspace))
+
+        db = tmp_path / "db.yml"
+        db.write_text("tasks:\n  migrate:\n    desc: Migrate the schema\n")
+        _age(db)
+        fingerprinter = TaskfileFingerprinter(TaskfileCache(tmp_path / "cache"))
+        after = fingerprinter.fingerprint(str(workspace))
+
+        assert fingerprinter.read_count == 1
+        assert after.sha256 != before.sha256
+        changed = [a.source for a, b in zip(after.nodes, before.nodes, strict=True) if a.sha256 != b.sha256]
+        assert changed == [str(db), str(tmp_path / "backend" / "Taskfile.yml"), str(workspace)]
+
+    def test_recent_files_are_rehashed(self, tmp_path, workspace):
+        """Test that files modified within the racy window are never trusted by stat."""
+        workspace.write_text(workspace.read_text() + "vars: {}\n")
+        TaskfileFingerprinter(TaskfileCache(tmp_path / "cache")).fingerprint(str(workspace))
+
+        fingerprinter = TaskfileFingerprinter(TaskfileCache(tmp_path / "cache"))
+        fingerprinter.fingerprint(str(workspace))
+        assert fingerprinter.read_count == 1
+
+    def test_remote_include_uses_cached_validators(self, tmp_path, workspace, remote_routes):
+        """Test that remote includes contribute cache entries and the lockfile, without fetching."""
+        cache = TaskfileCache(tmp_path / "cache", remote_ttl=0)
+        unknown = TaskfileFingerprinter(cache).fingerprint(str(workspace)).sha256
+        assert remote_routes.requested == []
+
+        remote_routes[REMOTE_URL] = "tasks: {}\n"
+        remote_routes.headers[REMOTE_URL] = {"ETag": '"v1"'}
+        cache.fetch(REMOTE_URL)
+        cached = TaskfileFingerprinter(cache).fingerprint(str(workspace)).sha256
+        assert cached != unknown
+
+        remote_routes[REMOTE_URL] = "tasks:\n  new: {}\n"
+        remote_routes.headers[REMOTE_URL] = {"ETag": '"v2"'}
+        cache.fetch(REMOTE_URL)
+        refetched = TaskfileFingerprinter(cache).fingerprint(str(workspace)).sha256
+        assert refetched != cached
+
+        RemoteBundle.for_taskfile(str(workspace)).lock([REMOTE_URL])
+        locked = TaskfileFingerprinter(cache).fingerprint(str(workspace)).sha256
+        assert locked != refetched
+
+    def test_missing_and_cyclic_includes(self, tmp_path):
+        """Test that missing files and include cycles still produce a hash."""
+        a = tmp_path / "a.yml"
+        b = tmp_path / "b.yml"
+        a.write_text("includes:\n  b: ./b.yml\n  gone: ./missing.yml\n")
+        b.write_text("includes:\n  a: ./a.yml\n")
+        fingerprint = TaskfileFingerprinter(TaskfileCache(tmp_path / "cache")).fingerprint(str(a))
+
+        assert [n.source for n in fingerprint.nodes] == [str(b), str(a)]
+
+    def test_digests_are_kept_per_root(self, tmp_path, workspace):
+        """Test that each root has its own digest map, holding only the files its tree still uses."""
+        cache = TaskfileCache(tmp_path / "cache")
+        TaskfileFingerprinter(cache).fingerprint(str(workspace))
+        other = tmp_path / "other.yml"
+        other.write_text("tasks: {}\n")
+        _age(other)
+        TaskfileFingerprinter(cache).fingerprint(str(other))
+        assert len(list((cache.root / "fingerprints").glob("*.json"))) == 2
+
+        workspace.write_text("tasks: {}\n")
+        _age(workspace)
+        fingerprinter = TaskfileFingerprinter(cache)
+        fingerprinter.fingerprint(str(workspace))
+        assert set(fingerprinter._load_digests(fingerprinter._digests_path(workspace))) == {str(workspace)}
+
+    def test_cli(self, tmp_path, workspace):
+        """Test that `parser fingerprint` prints the root hash."""
+        env = {**os.environ, CACHE_DIR_ENV: str(tmp_path / "cache")}
+        completed = subprocess.run(
+            [sys.executable, "-m", "taskfile_parser.cli", "fingerprint", "--pwd", str(tmp_path)],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        expected = TaskfileFingerprinter(TaskfileCache(tmp_path / "cache")).fingerprint(str(workspace)).sha256
+        assert completed.stdout == f"{expected}\n"
@@ -0,0 +1,121 @@
+import os
+import subprocess
+
+import pytest
+
+from taskfile_parser.repository.history import GitCatFile, TaskfileHistory
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def _git(repo, *args):
+    env = {**os.environ, **GIT_ENV}
+    return subprocess.run(["git", *args], cwd=repo, env=env, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit(repo, files, message):
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    return tmp_path
+
+
+class TestGitCatFile:
+    """Test cases for the GitCatFile class."""
+
+    def test_read_blob_and_missing(self, repo):
+        """Test reading an existing blob, a missing path and a tree."""
+        revision = _commit(repo, {"Taskfile.yml": "tasks: {}\n", "sub/a.txt": "a", "my dir/b.txt": "b"}, "init")
+        with GitCatFile(str(repo)) as cat:
+            oid, content = cat.read(f"{revision}:Taskfile.yml")
+            assert content == b"tasks: {}\n"
+            assert oid == _git(repo, "rev-parse", f"{revision}:Taskfile.yml")
+            assert cat.read(f"{revision}:missing.yml") is None
+            assert cat.read(f"{revision}:sub") is None
+            assert cat.read(f"{revision}:sub/a.txt")[1] == b"a"
+            # Specs containing spaces, missing or present
+            assert cat.read(f"{revision}:my dir/Taskfile.yml") is None
+            assert cat.read(f"{revision}:my dir/b.txt")[1] == b"b"
+
+
+class TestTaskfileHistory:
+    """Test cases for the TaskfileHistory class."""
+
+    def test_diffs_across_revisions(self, repo):
+        """Test added, removed and changed tasks including relative includes."""
+        first = _commit(
+            repo,
+            {
+                "Taskfile.yml": "includes:\n  backend: ./backend/Taskfile.yml\ntasks:\n  build:\n    desc: Build\n",
+                "backend/Taskfile.yml": "tasks:\n  deploy:\n    desc: Deploy\n",
+            },
+            "init",
+        )
+        second = _commit(
+            repo,
+            {"backend/Taskfile.yml": "tasks:\n  deploy:\n    desc: Deploy\n    requires:\n      vars: [ENV]\n"},
+            "require ENV",
+        )
+        third = _commit(repo, {"Taskfile.yml": "tasks:\n  test:\n    desc: Test\n"}, "drop include")
+
+        with TaskfileHistory(str(repo)) as history:
+            revisions = history.revisions()
+            assert revisions == [first, second, third]
+            diffs = history.diffs(revisions)
+
+        assert diffs[0].added == ["backend:deploy", "build"]
+        assert diffs[1].parent == first
+        assert diffs[1].added == [] and diffs[1].removed == []
+        assert [(c.command, c.fields) for c in diffs[1].changed] == [("backend:deploy", ["requires"])]
+        assert diffs[2].added == ["test"]
+        assert diffs[2].removed == ["backend:deploy", "build"]
+
+    def test_identical_blobs_parsed_once(self, repo):
+        """Test that unchanged Taskfiles are not parsed again across revisions."""
+        _commit(repo, {"Taskfile.yml": "tasks:\n  build:\n    desc: Build\n"}, "init")
+        for i in range(5):
+            _commit(repo, {f"file-{i}.txt": str(i)}, f"unrelated {i}")
+        _commit(repo, {"Taskfile.yml": "tasks:\n  build:\n    desc: Build it\n"}, "change")
+
+        with TaskfileHistory(str(repo)) as history:
+            diffs = history.diffs(history.revisions())
+            assert history.parse_count == 2
+
+        assert [d.is_empty() for d in diffs] == [False, True, True, True, True, True, False]
+        assert diffs[-1].changed[0].fields == ["desc"]
+
+    def test_subdirectory_and_max_count(self, repo):
+        """Test reading the Taskfile of a subdirectory and limiting revisions."""
+        _commit(repo, {"app/Taskfile.yml": "tasks:\n  a: {}\n"}, "one")
+        last = _commit(repo, {"app/Taskfile.yml": "tasks:\n  a: {}\n  b: {}\n"}, "two")
+
+        with TaskfileHistory(str(repo / "app")) as history:
+            revisions = history.revisions(max_count=1)
+            assert revisions == [last]
+            assert sorted(history.read_catalog(last)) == ["a", "b"]
+
+    def test_missing_include_with_space_in_path(self, repo):
+        """Test that an include path with spaces that is missing from the tree is skipped."""
+        revision = _commit(repo, {"Taskfile.yml": "includes:\n  sub: ./my dir/Taskfile.yml\ntasks:\n  a: {}\n"}, "init")
+        with TaskfileHistory(str(repo)) as history:
+            assert sorted(history.read_catalog(revision)) == ["a"]
+
+    def test_revision_without_taskfile(self, repo):
+        """Test that a revision without a Taskfile has an empty catalog."""
+        revision = _commit(repo, {"README.md": "hi"}, "init")
+        with TaskfileHistory(str(repo)) as history:
+            assert history.read_catalog(revision) == {}
@@ -0,0 +1,179 @@
+import io
+import time
+
+import pytest
+
+from taskfile_parser.domain.taskfile import LAZY_FIELDS
+from taskfile_parser.exceptions import YamlLimitError
+from taskfile_parser.repository.loader import (
+    DEFAULT_LOCAL_LIMITS,
+    DEFAULT_REMOTE_LIMITS,
+    DeferredValue,
+    YamlLimits,
+    load_yaml,
+)
+from taskfile_parser.repository.repository import TaskFileRepository
+
+LIMITS = YamlLimits(max_bytes=10_000, max_nodes=1_000, max_aliases=20, max_depth=10)
+
+BILLION_LAUGHS = """
+a: &a ["lol","lol","lol","lol","lol","lol","lol","lol","lol"]
+b: &b [*a,*a,*a,*a,*a,*a,*a,*a,*a]
+c: &c [*b,*b,*b,*b,*b,*b,*b,*b,*b]
+d: &d [*c,*c,*c,*c,*c,*c,*c,*c,*c]
+e: &e [*d,*d,*d,*d,*d,*d,*d,*d,*d]
+f: &f [*e,*e,*e,*e,*e,*e,*e,*e,*e]
+g: &g [*f,*f,*f,*f,*f,*f,*f,*f,*f]
+h: &h [*g,*g,*g,*g,*g,*g,*g,*g,*g]
+i: &i [*h,*h,*h,*h,*h,*h,*h,*h,*h]
+tasks: {}
+"""
+
+
+class TestLoadYaml:
+    """Test cases for loading YAML within limits."""
+
+    def test_load_within_limits(self):
+        """Test that ordinary documents load unchanged, including aliases."""
+        data = load_yaml("base: &base {desc: x}\ntasks:\n  a: *base\n", LIMITS)
+        assert data == {"base": {"desc": "x"}, "tasks": {"a": {"desc": "x"}}}
+
+    def test_load_stream(self):
+        """Test loading from a binary stream."""
+        assert load_yaml(io.BytesIO(b"tasks: {}\n"), LIMITS) == {"tasks": {}}
+
+    def test_rejects_alias_expansion_bomb(self):
+        """Test that alias expansion is charged per expanded node and fails fast."""
+        limits = YamlLimits(max_bytes=10_000, max_nodes=100_000, max_aliases=1_000, max_depth=10)
+        started = time.perf_counter()
+        with pytest.raises(YamlLimitError, match="exceeds 100000 nodes at line 7"):
+            load_yaml(BILLION_LAUGHS, limits)
+        assert time.perf_counter() - started < 5
+
+    def test_rejects_too_many_aliases(self):
+        """Test the alias reference limit."""
+        content = "a: &a x\nb: [" + ", ".join(["*a"] * 21) + "]\n"
+        with pytest.raises(YamlLimitError, match="exceeds 20 aliases at line 2"):
+            load_yaml(content, LIMITS)
+
+    def test_rejects_deep_nesting(self):
+        """Test the nesting depth limit."""
+        with pytest.raises(YamlLimitError, match="exceeds depth 10 at line 1, column 11"):
+            load_yaml("[" * 11 + "]" * 11, LIMITS)
+
+    def test_rejects_large_input(self):
+        """Test the byte limit for strings and streams."""
+        content = "a: " + "x" * 20_000 + "\n"
+        with pytest.raises(YamlLimitError, match="exceeds 10000 bytes"):
+            load_yaml(content, LIMITS)
+        with pytest.raises(YamlLimitError, match="exceeds 10000 bytes"):
+            load_yaml(io.BytesIO(content.encode("utf-8")), LIMITS)
+
+
+DEFERRED_CONTENT = """\
+x-common: &common
+  - echo common
+tasks:
+  a:
+    desc: A
+    summary: |2
+        indented
+      base
+    cmds:
+    - echo 1
+    - task: b
+      vars: {X: 1}
+    deps: [b,
+      c]
+    vars:
+      A: >-
+        folded
+        text
+  b: &b
+    desc: B
+    cmds: *common
+    deps: &deps [a]
+  c: {desc: C, cmds: [x]}
+  d:
+    <<: *b
+    desc: D
+"""
+
+
+def _load_deferred(value):
+    if isinstance(value, DeferredValue):
+        return value.load()
+    if isinstance(value, dict):
+        return {k: _load_deferred(v) for k, v in value.items()}
+    return value
+
+
+class TestDeferredTaskFields:
+    """Test cases for task fields deferred while composing."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            DEFERRED_CONTENT,
+            io.BytesIO(DEFERRED_CONTENT.encode("utf-8")),
+            io.BytesIO(DEFERRED_CONTENT.encode("utf-16")),
+            "\ufeff" + DEFERRED_CONTENT,
+        ],
+    )
+    def test_deferred_values_match_eager_load(self, content):
+        """Test that deferred values load to the same data as an eager load."""
+        data = load_yaml(content, DEFAULT_LOCAL_LIMITS, LAZY_FIELDS)
+
+        tasks = data["tasks"]
+        assert isinstance(tasks["a"]["summary"], DeferredValue)
+        assert isinstance(tasks["a"]["cmds"], DeferredValue)
+        assert not isinstance(tasks["c"]["cmds"], DeferredValue)
+        assert _load_deferred(data) == load_yaml(DEFERRED_CONTENT, DEFAULT_LOCAL_LIMITS)
+
+    def test_anchors_and_aliases_are_composed(self):
+        """Test that values using anchors or aliases are not deferred."""
+        tasks = load_yaml(DEFERRED_CONTENT, DEFAULT_LOCAL_LIMITS, LAZY_FIELDS)["tasks"]
+        assert tasks["b"]["cmds"] == ["echo common"]
+        assert tasks["b"]["deps"] == ["a"]
+        assert tasks["d"]["deps"] == ["a"]
+
+    def test_explicit_keys_are_composed(self):
+        """Test that values of explicit `? key` entries are not deferred."""
+        content = "tasks:\n  a:\n    ? cmds\n    : - echo a\n  b:\n    desc: B\n    ? summary\n    : text\n"
+        tasks = load_yaml(content, DEFAULT_LOCAL_LIMITS, LAZY_FIELDS)["tasks"]
+        assert tasks["a"]["cmds"] == ["echo a"]
+        assert tasks["b"]["summary"] == "text"
+
+    def test_deferred_values_count_against_limits(self):
+        """Test that skipped values are still charged for nodes and depth."""
+        content = "tasks:\n  a:\n    cmds:\n" + "".join(f"      - echo {i}\n" for i in range(100))
+        with pytest.raises(YamlLimitError, match="exceeds 50 nodes at line"):
+            load_yaml(content, LIMITS.model_copy(update={"max_nodes": 50}), LAZY_FIELDS)
+
+        content = "tasks:\n  a:\n    vars: " + "[" * 8 + "]" * 8 + "\n"
+        with pytest.raises(YamlLimitError, match="exceeds depth 10 at line 3"):
+            load_yaml(content, LIMITS, LAZY_FIELDS)
+
+
+class TestRepositoryLimits:
+    """Test cases for limits applied while reading tasks."""
+
+    def test_local_limits(self, tmp_path):
+        """Test that local files are read with the local limits."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text("tasks:\n" + "".join(f"  t{i}: {{}}\n" for i in range(100)))
+
+        with pytest.raises(YamlLimitError):
+            TaskFileRepository(
+                str(taskfile_path), local_limits=LIMITS.model_copy(update={"max_nodes": 50})
+            ).read_tasks()
+        assert len(TaskFileRepository(str(taskfile_path), local_limits=LIMITS).read_tasks()) == 100
+
+    def test_remote_limits(self, tmp_path, remote_routes):
+        """Test that a remote alias bomb is rejected with the remote limits."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text("includes:\n  remote: https://example.com/Taskfile.yml\ntasks: {}\n")
+        remote_routes["https://example.com/Taskfile.yml"] = BILLION_LAUGHS
+
+        with pytest.raises(YamlLimitError, match=f"exceeds {DEFAULT_REMOTE_LIMITS.max_nodes} nodes"):
+            TaskFileRepository(str(taskfile_path)).read_tasks()
@@ -0,0 +1,104 @@
+import hashlib
+
+import pytest
+
+from taskfile_parser.exceptions import LockfileError
+from taskfile_parser.repository.lockfile import BUNDLE_DIR_NAME, LOCKFILE_NAME, RemoteBundle
+from taskfile_parser.repository.repository import TaskFileRepository
+
+REMOTE_URL = "https://example.com/Taskfile.yml"
+REMOTE_CONTENT = """
+tasks:
+  remote-build:
+    desc: Build remotely
+"""
+
+
+@pytest.fixture
+def taskfile_path(tmp_path):
+    path = tmp_path / "Taskfile.yml"
+    path.write_text(
+        f"""
+includes:
+  remote: {REMOTE_URL}
+tasks:
+  local-task:
+    desc: Local task
+"""
+    )
+    return path
+
+
+class TestRemoteBundle:
+    """Test cases for the RemoteBundle class."""
+
+    def test_for_taskfile(self, taskfile_path):
+        """Test that the lockfile and bundle sit next to the taskfile."""
+        bundle = RemoteBundle.for_taskfile(str(taskfile_path))
+        assert bundle.lockfile_path == taskfile_path.parent / LOCKFILE_NAME
+        assert bundle.bundle_dir == taskfile_path.parent / BUNDLE_DIR_NAME
+        assert not bundle.exists()
+
+    def test_lock_records_and_vendors(self, taskfile_path, remote_routes):
+        """Test that lock records url, hash and size and vendors the body."""
+        bundle = RemoteBundle.for_taskfile(str(taskfile_path))
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        lockfile = bundle.lock([REMOTE_URL])
+
+        body = REMOTE_CONTENT.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        assert len(lockfile.includes) == 1
+        assert lockfile.includes[0].url == REMOTE_URL
+        assert lockfile.includes[0].sha256 == digest
+        assert lockfile.includes[0].size == len(body)
+        assert (bundle.bundle_dir / f"{digest}.yml").read_bytes() == body
+
+        reloaded = RemoteBundle.for_taskfile(str(taskfile_path)).load()
+        assert reloaded == lockfile
+
+    def test_read_tasks_from_bundle_without_network(self, taskfile_path, remote_routes):
+        """Test that read_tasks serves locked includes without calling httpx."""
+        bundle = RemoteBundle.for_taskfile(str(taskfile_path))
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        bundle.lock([REMOTE_URL])
+        remote_routes.requested.clear()
+
+        tasks = TaskFileRepository(str(taskfile_path), bundle=bundle).read_tasks()
+        assert remote_routes.requested == []
+
+        assert [t.gen_command() for t in tasks] == ["local-task", "remote:remote-build"]
+
+    def test_read_detects_tampered_bundle(self, taskfile_path, remote_routes):
+        """Test that a modified bundle body fails the integrity check."""
+        bundle = RemoteBundle.for_taskfile(str(taskfile_path))
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        lockfile = bundle.lock([REMOTE_URL])
+        (bundle.bundle_dir / f"{lockfile.includes[0].sha256}.yml").write_text("tasks: {}\n")
+
+        with pytest.raises(LockfileError):
+            TaskFileRepository(str(taskfile_path), bundle=bundle).read_tasks()
+
+    def test_frozen_rejects_unlocked_include(self, taskfile_path, remote_routes):
+        """Test that a frozen bundle refuses to fall back to the network."""
+        bundle = RemoteBundle.for_taskfile(str(taskfile_path), frozen=True)
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        bundle.lock([])
+
+        with pytest.raises(LockfileError):
+            TaskFileRepository(str(taskfile_path), bundle=bundle).read_tasks()
+        assert remote_routes.requested == []
+
+    def test_stale_urls(self, taskfile_path, remote_routes):
+        """Test detecting missing, extra and corrupted lock entries."""
+        bundle = RemoteBundle.for_taskfile(str(taskfile_path))
+        assert bundle.stale_urls([REMOTE_URL]) == [REMOTE_URL]
+
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+        lockfile = bundle.lock([REMOTE_URL])
+
+        assert bundle.stale_urls([REMOTE_URL]) == []
+        assert bundle.stale_urls([REMOTE_URL, "https://example.com/new.yml"]) == ["https://example.com/new.yml"]
+        assert bundle.stale_urls([]) == [REMOTE_URL]
+
+        (bundle.bundle_dir / f"{lockfile.includes[0].sha256}.yml").unlink()
+        assert bundle.stale_urls([REMOTE_URL]) == [REMOTE_URL]
@@ -0,0 +1,69 @@
+import gzip
+
+import pytest
+
+from taskfile_parser.exceptions import RemoteFetchError
+from taskfile_parser.repository.remote import RemoteBody, fetch_remote, is_remote
+from taskfile_parser.repository.repository import TaskFileRepository
+
+REMOTE_URL = "https://example.com/Taskfile.yml"
+REMOTE_CONTENT = """
+tasks:
+  remote-build:
+    desc: Build remotely
+"""
+
+
+class TestRemote:
+    """Test cases for streaming remote includes."""
+
+    def test_is_remote(self):
+        """Test detecting remote include locations."""
+        assert is_remote("https://example.com/Taskfile.yml")
+        assert not is_remote("./backend/Taskfile.yml")
+
+    def test_remote_body_reads_in_chunks(self):
+        """Test that RemoteBody serves sized reads across chunk boundaries."""
+        body = RemoteBody(iter([b"abc", b"de", b"", b"fgh"]))
+        assert body.read(2) == b"ab"
+        assert body.read(4) == b"cdef"
+        assert body.read() == b"gh"
+        assert body.read(1) == b""
+
+    def test_fetch_gzip_encoded(self, remote_routes):
+        """Test that gzip bodies are decoded."""
+        remote_routes[REMOTE_URL] = gzip.compress(REMOTE_CONTENT.encode("utf-8"))
+        remote_routes.headers[REMOTE_URL] = {"Content-Encoding": "gzip"}
+        assert fetch_remote(REMOTE_URL) == REMOTE_CONTENT.encode("utf-8")
+
+    def test_rejects_large_content_length(self, remote_routes):
+        """Test that an oversized Content-Length is rejected before reading the body."""
+        remote_routes[REMOTE_URL] = b"x" * 1024
+        with pytest.raises(RemoteFetchError, match="Content-Length"):
+            fetch_remote(REMOTE_URL, max_bytes=100)
+
+    def test_rejects_decompression_bomb(self, remote_routes):
+        """Test that a small compressed body inflating past the cap is rejected."""
+        remote_routes[REMOTE_URL] = gzip.compress(b"#" * (10 * 1024 * 1024))
+        remote_routes.headers[REMOTE_URL] = {"Content-Encoding": "gzip"}
+        with pytest.raises(RemoteFetchError, match="exceeds 65536 bytes"):
+            fetch_remote(REMOTE_URL, max_bytes=65536)
+
+    def test_rejects_unsupported_encoding(self, remote_routes):
+        """Test that encodings without bounded decoding are rejected."""
+        remote_routes[REMOTE_URL] = b"..."
+        remote_routes.headers[REMOTE_URL] = {"Content-Encoding": "br"}
+        with pytest.raises(RemoteFetchError, match="Unsupported Content-Encoding"):
+            fetch_remote(REMOTE_URL)
+
+    def test_read_tasks_raises_for_oversized_include(self, tmp_path, remote_routes):
+        """Test that read_tasks surfaces oversized includes instead of skipping them."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(f"includes:\n  remote: {REMOTE_URL}\ntasks: {{}}\n")
+        remote_routes[REMOTE_URL] = REMOTE_CONTENT
+
+        with pytest.raises(RemoteFetchError):
+            TaskFileRepository(str(taskfile_path), max_remote_bytes=10).read_tasks()
+
+        tasks = TaskFileRepository(str(taskfile_path)).read_tasks()
+        assert [t.gen_command() for t in tasks] == ["remote:remote-build"]
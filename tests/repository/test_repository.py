@@ -1,5 +1,5 @@
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import httpx
 
@@ -183,6 +183,27 @@ tasks:
         assert backend_tasks[0].name == "build"
         assert backend_tasks[1].name == "test"
 
+    def test_read_tasks_parses_repeated_include_once(self, tmp_path):
+        """Test that a file included under several prefixes is parsed once."""
+        (tmp_path / "deploy").mkdir()
+        (tmp_path / "deploy" / "Taskfile.yml").write_text("tasks:\n  apply:\n    desc: Apply\n    deps: [plan]\n")
+        regions = [f"region-{i}" for i in range(30)]
+        main_taskfile = tmp_path / "Taskfile.yml"
+        main_taskfile.write_text(
+            "includes:\n"
+            + "".join(f"  {r}:\n    taskfile: ./deploy/Taskfile.yml\n    vars: {{REGION: {r}}}\n" for r in regions)
+        )
+
+        read_from_content = TaskFileRepository._read_from_content
+        with patch.object(TaskFileRepository, "_read_from_content", side_effect=read_from_content) as parse:
+            tasks = TaskFileRepository(path=str(main_taskfile)).read_tasks()
+
+        # One parse for the root taskfile and one for the template
+        assert parse.call_count == 2
+        assert [t.gen_command() for t in tasks] == [f"{r}:apply" for r in regions]
+        assert tasks[0].gen_deps() == ["region-0:plan"]
+        assert tasks[1].gen_deps() == ["region-1:plan"]
+
     def test_read_tasks_with_nested_includes(self, tmp_path):
         """Test read_tasks method with nested includes (not expanded recursively)."""
         # Create main Taskfile
@@ -214,7 +235,7 @@ tasks:
         assert any(t.name == "main" for t in tasks)
         assert any(t.name == "sub-task" and t.prefix == "sub" for t in tasks)
 
-    def test_read_tasks_with_remote_includes_skipped(self, tmp_path):
+    def test_read_tasks_with_remote_includes_skipped(self, tmp_path, remote_routes):
         """Test that remote includes (https://) are gracefully handled when fetch fails."""
         taskfile_path = tmp_path / "Taskfile.yml"
         taskfile_content = """
@@ -226,17 +247,16 @@ tasks:
 """
         taskfile_path.write_text(taskfile_content)
 
-        # Mock httpx.get to raise an exception
-        with patch("taskfile_parser.repository.repository.httpx.get") as mock_get:
-            mock_get.side_effect = httpx.HTTPError("Network error")
-            repo = TaskFileRepository(path=str(taskfile_path))
-            tasks = repo.read_tasks()
+        # Make the remote fetch raise a network error
+        remote_routes["https://example.com/Taskfile.yml"] = httpx.ConnectError("Network error")
+        repo = TaskFileRepository(path=str(taskfile_path))
+        tasks = repo.read_tasks()
 
-            # Only local task should be present, remote include is skipped due to error
-            assert len(tasks) == 1
-            assert tasks[0].name == "local-task"
+        # Only local task should be present, remote include is skipped due to error
+        assert len(tasks) == 1
+        assert tasks[0].name == "local-task"
 
-    def test_read_tasks_with_remote_includes_success(self, tmp_path):
+    def test_read_tasks_with_remote_includes_success(self, tmp_path, remote_routes):
         """Test that remote includes (https://) are fetched and parsed successfully."""
         taskfile_path = tmp_path / "Taskfile.yml"
         taskfile_content = """
@@ -256,35 +276,29 @@ tasks:
   remote-test:
     desc: Test remotely
 """
+        remote_routes["https://example.com/Taskfile.yml"] = remote_content
+
+        repo = TaskFileRepository(path=str(taskfile_path))
+        tasks = repo.read_tasks()
 
-        # Mock httpx.get to return the remote content
-        with patch("taskfile_parser.repository.repository.httpx.get") as mock_get:
-            mock_response = MagicMock()
-            mock_response.text = remote_content
-            mock_response.raise_for_status = MagicMock()
-            mock_get.return_value = mock_response
-
-            repo = TaskFileRepository(path=str(taskfile_path))
-            tasks = repo.read_tasks()
-
-            # Should have local task + 2 remote tasks
-            assert len(tasks) == 3
-
-            # Check local task
-            local_tasks = [t for t in tasks if t.name == "local-task"]
-            assert len(local_tasks) == 1
-            assert local_tasks[0].desc == "Local task"
-            assert local_tasks[0].prefix is None
-
-            # Check remote tasks
-            remote_tasks = [t for t in tasks if t.prefix == "remote"]
-            assert len(remote_tasks) == 2
-            assert remote_tasks[0].name == "remote-build"
-            assert remote_tasks[0].desc == "Build remotely"
-            assert remote_tasks[1].name == "remote-test"
-            assert remote_tasks[1].desc == "Test remotely"
-
-    def test_read_tasks_with_multiple_remote_includes(self, tmp_path):
+        # Should have local task + 2 remote tasks
+        assert len(tasks) == 3
+
+        # Check local task
+        local_tasks = [t for t in tasks if t.name == "local-task"]
+        assert len(local_tasks) == 1
+        assert local_tasks[0].desc == "Local task"
+        assert local_tasks[0].prefix is None
+
+        # Check remote tasks
+        remote_tasks = [t for t in tasks if t.prefix == "remote"]
+        assert len(remote_tasks) == 2
+        assert remote_tasks[0].name == "remote-build"
+        assert remote_tasks[0].desc == "Build remotely"
+        assert remote_tasks[1].name == "remote-test"
+        assert remote_tasks[1].desc == "Test remotely"
+
+    def test_read_tasks_with_multiple_remote_includes(self, tmp_path, remote_routes):
         """Test handling multiple remote includes."""
         taskfile_path = tmp_path / "Taskfile.yml"
         taskfile_content = """
@@ -298,46 +312,32 @@ tasks:
         taskfile_path.write_text(taskfile_content)
 
         # Mock the remote taskfile contents
-        remote1_content = """
+        remote_routes["https://example.com/remote1.yml"] = """
 tasks:
   task1:
     desc: Task from remote1
 """
-        remote2_content = """
+        remote_routes["https://example.com/remote2.yml"] = """
 tasks:
   task2:
     desc: Task from remote2
 """
 
-        def mock_get_side_effect(url):
-            mock_response = MagicMock()
-            if url == "https://example.com/remote1.yml":
-                mock_response.text = remote1_content
-            elif url == "https://example.com/remote2.yml":
-                mock_response.text = remote2_content
-            else:
-                raise httpx.HTTPError("URL not found")
-            mock_response.raise_for_status = MagicMock()
-            return mock_response
-
-        with patch("taskfile_parser.repository.repository.httpx.get") as mock_get:
-            mock_get.side_effect = mock_get_side_effect
-
-            repo = TaskFileRepository(path=str(taskfile_path))
-            tasks = repo.read_tasks()
+        repo = TaskFileRepository(path=str(taskfile_path))
+        tasks = repo.read_tasks()
 
-            # Should have 1 local task + 2 remote tasks
-            assert len(tasks) == 3
+        # Should have 1 local task + 2 remote tasks
+        assert len(tasks) == 3
 
-            # Check tasks from remote1
-            remote1_tasks = [t for t in tasks if t.prefix == "remote1"]
-            assert len(remote1_tasks) == 1
-            assert remote1_tasks[0].name == "task1"
+        # Check tasks from remote1
+        remote1_tasks = [t for t in tasks if t.prefix == "remote1"]
+        assert len(remote1_tasks) == 1
+        assert remote1_tasks[0].name == "task1"
 
-            # Check tasks from remote2
-            remote2_tasks = [t for t in tasks if t.prefix == "remote2"]
-            assert len(remote2_tasks) == 1
-            assert remote2_tasks[0].name == "task2"
+        # Check tasks from remote2
+        remote2_tasks = [t for t in tasks if t.prefix == "remote2"]
+        assert len(remote2_tasks) == 1
+        assert remote2_tasks[0].name == "task2"
 
     def test_read_empty_taskfile(self, tmp_path):
         """Test reading a Taskfile with no tasks or includes."""
@@ -408,6 +408,56 @@ tasks:
         assert "VAR2=" in buffer
         assert "task deploy" in buffer
 
+    def test_read_taskfile_with_aliases(self, tmp_path):
+        """Test reading task aliases and wildcard task names."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_content = """
+tasks:
+  deploy:*:
+    desc: Deploy to an environment
+    aliases: [d]
+"""
+        taskfile_path.write_text(taskfile_content)
+
+        repo = TaskFileRepository(path=str(taskfile_path), prefix="infra")
+        taskfile = repo._read()
+
+        assert taskfile.tasks[0].name == "deploy:*"
+        assert taskfile.tasks[0].aliases == ["d"]
+        assert taskfile.tasks[0].gen_aliases() == ["infra:d"]
+
+    def test_read_taskfile_with_lazy_fields(self, tmp_path):
+        """Test that cmds, summary, deps and vars load on access and match an eager read."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_content = """
+tasks:
+  build:
+    desc: Build
+    summary: |
+      Build the application
+    deps: [lint]
+    vars:
+      TARGET: app
+    cmds:
+      - go build ./...
+      - task: lint
+  lint:
+    desc: Lint
+"""
+        taskfile_path.write_text(taskfile_content)
+
+        repo = TaskFileRepository(path=str(taskfile_path))
+        build, lint = repo._read().tasks
+
+        assert build.desc == "Build"
+        assert build.summary == "Build the application\n"
+        assert build.deps == ["lint"]
+        assert build.vars == {"TARGET": "app"}
+        assert build.cmds == ["go build ./...", {"task": "lint"}]
+        assert lint.cmds == []
+        assert lint.summary == ""
+        assert [build, lint] == TaskFileRepository._read_from_content(taskfile_content, lazy=False).tasks
+
 
 class TestTaskfileFinder:
     """Test cases for the TaskfileFinder class."""
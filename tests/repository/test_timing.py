@@ -0,0 +1,30 @@
+from taskfile_parser.domain.timing import TimingRecord
+from taskfile_parser.repository.timing import TimingRepository
+
+
+class TestTimingRepository:
+    """Test cases for the TimingRepository class."""
+
+    def test_append_and_read(self, tmp_path):
+        """Test appending records and reading them back."""
+        repo = TimingRepository(str(tmp_path / "timings.jsonl"))
+        assert repo.read() == []
+
+        repo.append(TimingRecord(task="build", duration=1.5, recorded_at=1))
+        repo.append(TimingRecord(task="test", duration=3.0, recorded_at=2))
+
+        assert [r.task for r in repo.read()] == ["build", "test"]
+
+    def test_estimates_use_recent_window(self, tmp_path):
+        """Test that estimates average the most recent runs."""
+        repo = TimingRepository(str(tmp_path / "timings.jsonl"))
+        for i, duration in enumerate([100, 1, 2, 3]):
+            repo.append(TimingRecord(task="build", duration=duration, recorded_at=i))
+
+        assert repo.estimates(window=3) == {"build": 2}
+
+    def test_read_skips_broken_lines(self, tmp_path):
+        """Test that truncated lines are ignored."""
+        path = tmp_path / "timings.jsonl"
+        path.write_text('{"task": "build", "duration": 1, "recorded_at": 0}\n{"task": "te\n\n')
+        assert [r.task for r in TimingRepository(str(path)).read()] == ["build"]
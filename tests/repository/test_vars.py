@@ -0,0 +1,244 @@
+from taskfile_parser.repository.repository import TaskFileRepository
+from taskfile_parser.repository.vars import ShellVarEvaluator
+
+
+class CountingEvaluator(ShellVarEvaluator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls: list[tuple[str, str]] = []
+
+    def _run(self, command, cwd):
+        self.calls.append((command, cwd))
+        return super()._run(command, cwd)
+
+
+class TestShellVarEvaluator:
+    """Test cases for the ShellVarEvaluator class."""
+
+    def test_evaluate_runs_each_command_once(self, tmp_path):
+        """Test that duplicated commands are run once and cached."""
+        evaluator = CountingEvaluator()
+        commands = [("echo a", str(tmp_path))] * 5 + [("echo b", str(tmp_path))]
+
+        results = evaluator.evaluate(commands)
+        assert results == {("echo a", str(tmp_path)): "a", ("echo b", str(tmp_path)): "b"}
+        assert len(evaluator.calls) == 2
+
+        evaluator.evaluate(commands)
+        assert len(evaluator.calls) == 2
+
+    def test_evaluate_cache_is_keyed_by_cwd(self, tmp_path):
+        """Test that the same command in another directory is run again."""
+        (tmp_path / "sub").mkdir()
+        evaluator = CountingEvaluator()
+        results = evaluator.evaluate([("pwd", str(tmp_path)), ("pwd", str(tmp_path / "sub"))])
+
+        assert results[("pwd", str(tmp_path))] == str(tmp_path)
+        assert results[("pwd", str(tmp_path / "sub"))] == str(tmp_path / "sub")
+        assert len(evaluator.calls) == 2
+
+    def test_evaluate_expired_entries_rerun(self, tmp_path):
+        """Test that entries older than the TTL are evaluated again."""
+        evaluator = CountingEvaluator(ttl=0)
+        evaluator.evaluate([("echo a", str(tmp_path))])
+        evaluator.evaluate([("echo a", str(tmp_path))])
+        assert len(evaluator.calls) == 2
+
+    def test_evaluate_failed_command(self, tmp_path):
+        """Test that a failing command maps to None."""
+        assert ShellVarEvaluator().evaluate([("exit 3", str(tmp_path))]) == {("exit 3", str(tmp_path)): None}
+
+
+class TestResolveVars:
+    """Test cases for resolving `vars` while reading tasks."""
+
+    def test_global_default(self, tmp_path):
+        """Test that a global var pre-fills a required var."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(
+            """
+vars:
+  ENV: dev
+tasks:
+  deploy:
+    requires:
+      vars: [ENV, REGION]
+"""
+        )
+        tasks = TaskFileRepository(str(taskfile_path), resolve_vars=True).read_tasks()
+        assert tasks[0].gen_buffer() == "ENV=dev REGION= task deploy"
+
+    def test_precedence(self, tmp_path):
+        """Test task > included file > include entry > root global precedence."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "Taskfile.yml").write_text(
+            """
+vars:
+  B: included-global
+  C: included-global
+tasks:
+  run:
+    vars:
+      C: task
+    requires:
+      vars: [A, B, C, D]
+"""
+        )
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(
+            """
+vars:
+  A: root
+  B: root
+  C: root
+  D: root
+includes:
+  sub:
+    taskfile: ./sub/Taskfile.yml
+    vars:
+      A: include
+      B: include
+"""
+        )
+        tasks = TaskFileRepository(str(taskfile_path), resolve_vars=True).read_tasks()
+        assert tasks[0].resolved_vars == {"A": "include", "B": "included-global", "C": "task", "D": "root"}
+
+    def test_dynamic_vars_run_once_in_declaring_dir(self, tmp_path):
+        """Test that a shared `sh:` var runs once, in the directory of its Taskfile."""
+        lines = ["vars:", "  WHERE:", "    sh: pwd", "tasks:"]
+        for i in range(20):
+            lines += [f"  task-{i}:", "    requires:", "      vars: [WHERE]"]
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text("\n".join(lines) + "\n")
+
+        evaluator = CountingEvaluator()
+        tasks = TaskFileRepository(str(taskfile_path), resolve_vars=True, evaluator=evaluator).read_tasks()
+
+        assert len(evaluator.calls) == 1
+        assert all(t.resolved_vars == {"WHERE": str(tmp_path)} for t in tasks)
+
+    def test_shadowed_and_unrequired_dynamic_vars_are_not_run(self, tmp_path):
+        """Test that only the winning definition of a required var is evaluated."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(
+            """
+vars:
+  ENV:
+    sh: echo global
+  UNUSED:
+    sh: echo unused
+tasks:
+  deploy:
+    vars:
+      ENV: task
+    requires:
+      vars: [ENV]
+"""
+        )
+        evaluator = CountingEvaluator()
+        tasks = TaskFileRepository(str(taskfile_path), resolve_vars=True, evaluator=evaluator).read_tasks()
+
+        assert evaluator.calls == []
+        assert tasks[0].gen_buffer() == "ENV=task task deploy"
+
+    def test_parameterized_includes(self, tmp_path):
+        """Test that each include of one template resolves its own vars and `dir`."""
+        (tmp_path / "deploy").mkdir()
+        (tmp_path / "eu").mkdir()
+        (tmp_path / "deploy" / "Taskfile.yml").write_text(
+            "vars:\n  WHERE:\n    sh: pwd\ntasks:\n  apply:\n    requires:\n      vars: [REGION, WHERE]\n"
+        )
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(
+            """
+includes:
+  us:
+    taskfile: ./deploy/Taskfile.yml
+    vars: {REGION: us-east-1}
+  eu:
+    taskfile: ./deploy/Taskfile.yml
+    dir: ./eu
+    vars: {REGION: eu-west-1}
+"""
+        )
+        tasks = TaskFileRepository(str(taskfile_path), resolve_vars=True).read_tasks()
+
+        assert [t.gen_buffer() for t in tasks] == [
+            f"REGION=us-east-1 WHERE={tmp_path / 'deploy'} task us:apply",
+            f"REGION=eu-west-1 WHERE={tmp_path / 'eu'} task eu:apply",
+        ]
+
+    def test_resolve_vars_off_by_default(self, tmp_path):
+        """Test that read_tasks runs no `sh:` var unless resolution is requested."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(
+            "vars:\n  ENV: dev\n  WHERE:\n    sh: pwd\ntasks:\n  deploy:\n    requires:\n      vars: [ENV, WHERE]\n"
+        )
+        evaluator = CountingEvaluator()
+        tasks = TaskFileRepository(str(taskfile_path), evaluator=evaluator).read_tasks()
+        assert evaluator.calls == []
+        assert tasks[0].gen_buffer() == "ENV= WHERE= task deploy"
+
+    def test_resolve_task_vars_runs_only_requested_task(self, tmp_path):
+        """Test that resolving one task does not run the dynamic vars of the others."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(
+            """
+tasks:
+  build:
+    vars:
+      WHERE:
+        sh: echo build
+    requires:
+      vars: [WHERE]
+  deploy:
+    vars:
+      WHERE:
+        sh: echo deploy
+    requires:
+      vars: [WHERE]
+"""
+        )
+        evaluator = CountingEvaluator()
+        repository = TaskFileRepository(str(taskfile_path), evaluator=evaluator)
+        build, deploy = repository.read_tasks()
+        repository.resolve_task_vars([build])
+
+        assert evaluator.calls == [("echo build", str(tmp_path))]
+        assert build.resolved_vars == {"WHERE": "build"}
+        assert deploy.resolved_vars == {}
+
+    def test_remote_dynamic_vars_are_not_run(self, tmp_path, remote_routes):
+        """Test that `sh:` vars defined by a remote include are left unresolved."""
+        url = "https://example.com/Taskfile.yml"
+        remote_routes[url] = "vars:\n  ENV:\n    sh: echo remote\ntasks:\n  deploy:\n    requires:\n      vars: [ENV]\n"
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(f"includes:\n  remote: {url}\n")
+
+        evaluator = CountingEvaluator()
+        tasks = TaskFileRepository(str(taskfile_path), resolve_vars=True, evaluator=evaluator).read_tasks()
+
+        assert evaluator.calls == []
+        assert tasks[0].gen_buffer() == "ENV= task remote:deploy"
+
+    def test_templated_values_are_not_resolved(self, tmp_path):
+        """Test that values using go-task templates are left unresolved."""
+        taskfile_path = tmp_path / "Taskfile.yml"
+        taskfile_path.write_text(
+            """
+vars:
+  ENV: dev
+  NAME: "{{.ENV}}-app"
+  WHERE:
+    sh: echo {{.ENV}}
+tasks:
+  deploy:
+    requires:
+      vars: [ENV, NAME, WHERE]
+"""
+        )
+        evaluator = CountingEvaluator()
+        tasks = TaskFileRepository(str(taskfile_path), resolve_vars=True, evaluator=evaluator).read_tasks()
+
+        assert evaluator.calls == []
+        assert tasks[0].gen_buffer() == "ENV=dev NAME= WHERE= task deploy"
@@ -0,0 +1,79 @@
+import sys
+
+import pytest
+
+from taskfile_parser.cli import main
+from taskfile_parser.exceptions import RemoteFetchError
+from taskfile_parser.repository.cache import CACHE_DIR_ENV, TaskfileCache
+from taskfile_parser.repository.fingerprint import TaskfileFingerprinter
+from taskfile_parser.repository.lockfile import LOCKFILE_NAME
+from taskfile_parser.repository.timing import DEFAULT_TIMINGS_PATH
+
+REMOTE_URL = "https://example.com/Taskfile.yml"
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "Taskfile.yml").write_text(f"includes:\n  remote: {REMOTE_URL}\ntasks:\n  build: {{}}\n")
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    # Run from elsewhere, so a subcommand falling back to "." would miss the project
+    monkeypatch.chdir(tmp_path)
+    return root
+
+
+def _main(monkeypatch, *args: str) -> str:
+    monkeypatch.setattr(sys, "argv", ["parser", *args])
+    return main()
+
+
+class TestGlobalOptions:
+    """Test cases for options given before or after a subcommand."""
+
+    @pytest.mark.parametrize("order", ["before", "after"])
+    def test_frozen_lock(self, monkeypatch, project, remote_routes, order):
+        """Test that `--frozen lock` checks the lockfile instead of rewriting it."""
+        flags = ["--pwd", str(project), "--frozen"]
+        args = [*flags, "lock"] if order == "before" else ["lock", *flags]
+        with pytest.raises(SystemExit, match="Lockfile is stale"):
+            _main(monkeypatch, *args)
+        assert remote_routes.requested == []
+        assert not (project / LOCKFILE_NAME).exists()
+
+    @pytest.mark.parametrize("order", ["before", "after"])
+    def test_max_remote_bytes_lock(self, monkeypatch, project, remote_routes, order):
+        """Test that the size cap applies to `lock` wherever it is given."""
+        remote_routes[REMOTE_URL] = "tasks:\n  remote-build: {}\n"
+        flags = ["--pwd", str(project), "--max-remote-bytes", "5"]
+        args = [*flags, "lock"] if order == "before" else ["lock", *flags]
+        with pytest.raises(RemoteFetchError):
+            _main(monkeypatch, *args)
+
+    @pytest.mark.parametrize("order", ["before", "after"])
+    def test_pwd_fingerprint(self, monkeypatch, project, capsys, order):
+        """Test that `--pwd` selects the project for subcommands wherever it is given."""
+        flags = ["--pwd", str(project)]
+        args = [*flags, "fingerprint"] if order == "before" else ["fingerprint", *flags]
+        output = _main(monkeypatch, *args)
+        expected = TaskfileFingerprinter(TaskfileCache()).fingerprint(str(project / "Taskfile.yml")).sha256
+        assert output == expected
+
+    @pytest.mark.parametrize("order", ["before", "after"])
+    def test_record(self, monkeypatch, project, order):
+        """Test that `record` takes the task name and `--pwd` from before the subcommand too."""
+        flags = ["--pwd", str(project), "--taskfile-task-name", "build"]
+        args = [*flags, "record"] if order == "before" else ["record", *flags]
+        _main(monkeypatch, *args, "--", sys.executable, "-c", "pass")
+        assert '"task":"build"' in (project / DEFAULT_TIMINGS_PATH).read_text()
+
+    def test_record_requires_task_name(self, monkeypatch, project):
+        """Test that `record` still fails without a task name."""
+        with pytest.raises(SystemExit):
+            _main(monkeypatch, "record", "--pwd", str(project), "--", sys.executable, "-c", "pass")
+
+    def test_subcommand_pwd_defaults_to_cwd(self, monkeypatch, project, remote_routes):
+        """Test that subcommands without `--pwd` run against the current directory."""
+        monkeypatch.chdir(project)
+        with pytest.raises(SystemExit, match="Lockfile is stale"):
+            _main(monkeypatch, "lock", "--frozen")